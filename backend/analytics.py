@@ -0,0 +1,154 @@
+"""Season analytics computed on a columnar frame of finished matches"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MATCH_FIELDS = ("id", "home_team_id", "away_team_id", "home_team_score", "away_team_score", "match_date")
+
+
+async def load_match_frame(collection, query: dict) -> pd.DataFrame:
+    """Finished matches as one column per field, in kick-off order, from a single cursor pass.
+
+    Matches without both scores are left out rather than counted as 0-0.
+    """
+    query = {**query, "home_team_score": {"$ne": None}, "away_team_score": {"$ne": None}}
+    projection = {"_id": 0, **{field: 1 for field in MATCH_FIELDS}}
+    columns: Dict[str, list] = {field: [] for field in MATCH_FIELDS}
+    async for match in collection.find(query, projection).sort([("match_date", 1), ("id", 1)]):
+        for field in MATCH_FIELDS:
+            columns[field].append(match.get(field))
+
+    frame = pd.DataFrame(columns, columns=list(MATCH_FIELDS))
+    for field in ("home_team_score", "away_team_score"):
+        frame[field] = pd.to_numeric(frame[field]).astype(np.int64)
+    frame["match_date"] = pd.to_datetime(frame["match_date"])
+    return frame
+
+
+def team_rows(frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per team and match (home rows then away rows), keeping the match order"""
+    home = pd.DataFrame({
+        "order": frame.index,
+        "team_id": frame["home_team_id"],
+        "is_home": True,
+        "scored": frame["home_team_score"],
+        "conceded": frame["away_team_score"],
+    })
+    away = pd.DataFrame({
+        "order": frame.index,
+        "team_id": frame["away_team_id"],
+        "is_home": False,
+        "scored": frame["away_team_score"],
+        "conceded": frame["home_team_score"],
+    })
+    return pd.concat([home, away], ignore_index=True)
+
+
+def home_advantage(frame: pd.DataFrame) -> dict:
+    """Share of home wins, draws and away wins, and the goals and points edge of playing at home"""
+    matches = len(frame)
+    if not matches:
+        return {
+            "matches": 0, "home_win_share": 0.0, "draw_share": 0.0, "away_win_share": 0.0,
+            "home_goals_per_match": 0.0, "away_goals_per_match": 0.0,
+            "home_points_per_match": 0.0, "away_points_per_match": 0.0,
+        }
+
+    margin = np.sign(frame["home_team_score"].to_numpy() - frame["away_team_score"].to_numpy())
+    home_wins, draws, away_wins = (margin > 0).sum(), (margin == 0).sum(), (margin < 0).sum()
+    return {
+        "matches": matches,
+        "home_win_share": round(float(home_wins / matches), 4),
+        "draw_share": round(float(draws / matches), 4),
+        "away_win_share": round(float(away_wins / matches), 4),
+        "home_goals_per_match": round(float(frame["home_team_score"].mean()), 4),
+        "away_goals_per_match": round(float(frame["away_team_score"].mean()), 4),
+        "home_points_per_match": round(float((3 * home_wins + draws) / matches), 4),
+        "away_points_per_match": round(float((3 * away_wins + draws) / matches), 4),
+    }
+
+
+def goals_distribution(frame: pd.DataFrame) -> dict:
+    """How many matches ended with each total number of goals, with summary figures"""
+    totals = (frame["home_team_score"] + frame["away_team_score"]).to_numpy()
+    matches = len(totals)
+    counts = np.bincount(totals) if matches else np.zeros(0, dtype=np.int64)
+    return {
+        "mean": round(float(totals.mean()), 4) if matches else 0.0,
+        "median": float(np.median(totals)) if matches else 0.0,
+        "std": round(float(totals.std()), 4) if matches else 0.0,
+        "over_2_5_share": round(float((totals > 2.5).mean()), 4) if matches else 0.0,
+        "both_teams_scored_share": round(float(
+            ((frame["home_team_score"] > 0) & (frame["away_team_score"] > 0)).mean()
+        ), 4) if matches else 0.0,
+        "buckets": [
+            {"goals": goals, "matches": int(count), "share": round(float(count / matches), 4)}
+            for goals, count in enumerate(counts) if count
+        ],
+    }
+
+
+def team_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Clean sheets, scoring streaks and attack/defence strength per team, indexed by team_id"""
+    rows = team_rows(frame)
+    columns = [
+        "played", "goals_for", "goals_against", "clean_sheets", "home_clean_sheets", "away_clean_sheets",
+        "longest_scoring_streak", "current_scoring_streak", "longest_scoreless_streak",
+        "attack_strength", "defence_strength",
+    ]
+    if rows.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="team_id"))
+
+    rows["clean_sheet"] = rows["conceded"] == 0
+    rows["home_clean_sheet"] = rows["clean_sheet"] & rows["is_home"]
+    rows["away_clean_sheet"] = rows["clean_sheet"] & ~rows["is_home"]
+    table = rows.groupby("team_id").agg(
+        played=("order", "size"),
+        goals_for=("scored", "sum"),
+        goals_against=("conceded", "sum"),
+        clean_sheets=("clean_sheet", "sum"),
+        home_clean_sheets=("home_clean_sheet", "sum"),
+        away_clean_sheets=("away_clean_sheet", "sum"),
+    )
+
+    # Streaks: consecutive matches of a team with the same "scored" flag form a run
+    rows = rows.sort_values(["team_id", "order"], kind="stable")
+    scored = (rows["scored"] > 0).to_numpy()
+    team_ids = rows["team_id"].to_numpy()
+    starts = np.ones(len(rows), dtype=bool)
+    starts[1:] = (scored[1:] != scored[:-1]) | (team_ids[1:] != team_ids[:-1])
+    runs = pd.DataFrame({"team_id": team_ids[starts], "scored": scored[starts]})
+    runs["length"] = np.diff(np.append(np.flatnonzero(starts), len(rows)))
+    longest = runs.groupby(["team_id", "scored"])["length"].max().unstack(fill_value=0)
+    last = runs.groupby("team_id").tail(1).set_index("team_id")
+    table["longest_scoring_streak"] = longest.get(True, 0)
+    table["longest_scoreless_streak"] = longest.get(False, 0)
+    table["current_scoring_streak"] = last["length"].where(last["scored"], 0)
+    table[["longest_scoring_streak", "longest_scoreless_streak", "current_scoring_streak"]] = (
+        table[["longest_scoring_streak", "longest_scoreless_streak", "current_scoring_streak"]].fillna(0).astype(np.int64)
+    )
+
+    # Strength: goals per match relative to the league average (1.0 is average;
+    # above 1 scores more, resp. concedes more, than an average team)
+    league_average = rows["scored"].mean() or 1.0
+    per_match_for = table["goals_for"] / table["played"]
+    per_match_against = table["goals_against"] / table["played"]
+    table["attack_strength"] = (per_match_for / league_average).round(4)
+    table["defence_strength"] = (per_match_against / league_average).round(4)
+    return table[columns]
+
+
+def season_analytics(frame: pd.DataFrame, team_names: Optional[Dict[str, str]] = None) -> dict:
+    team_names = team_names or {}
+    table = team_table(frame).sort_values(["attack_strength", "defence_strength"], ascending=[False, True])
+    teams: List[dict] = [
+        {"team_id": team_id, "team_name": team_names.get(team_id, ""), **row}
+        for team_id, row in zip(table.index, table.to_dict("records"))
+    ]
+    return {
+        "matches": len(frame),
+        "home_advantage": home_advantage(frame),
+        "goals_distribution": goals_distribution(frame),
+        "teams": teams,
+    }
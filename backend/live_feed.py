@@ -0,0 +1,115 @@
+"""In-process pub/sub for the live score feed (Server-Sent Events)"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+QUEUE_SIZE = 100
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class LiveFeed:
+    """Fan out events to every subscriber queue.
+
+    Each event is encoded once as an SSE frame, so an extra subscriber
+    only costs a queue slot per event. A subscriber that falls behind
+    drops its oldest frames instead of blocking the publisher.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, data) -> None:
+        if not self._subscribers:
+            return
+        frame = f"event: {event}\ndata: {json.dumps(data, default=_json_default, separators=(',', ':'))}\n\n"
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def stream(self, is_disconnected: Callable[[], Awaitable[bool]]):
+        """Yield SSE frames for one subscriber, with keep-alive comments while idle"""
+        queue = self.subscribe()
+        try:
+            yield f"retry: {HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+
+async def watch_match_changes(
+    collection,
+    on_change: Callable[[Optional[dict], dict], None],
+    retry_seconds: float = 5,
+    pre_images: bool = True,
+):
+    """Feed match updates from a MongoDB change stream, for multi-worker deployments.
+
+    Requires a replica set. Pre-images (MongoDB 6.0+) provide the state
+    before the update; without them `on_change` receives None as before.
+    Servers that reject the pre-image option are watched without it.
+    """
+    resume_token = None
+    pipeline = [{"$match": {"operationType": {"$in": ["update", "replace"]}}}]
+    while True:
+        options = {"full_document_before_change": "whenAvailable"} if pre_images else {}
+        try:
+            async with collection.watch(
+                pipeline,
+                full_document="updateLookup",
+                resume_after=resume_token,
+                **options,
+            ) as stream:
+                logger.info("Live feed change stream opened on %s", collection.name)
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    if change.get("fullDocument"):
+                        on_change(change.get("fullDocumentBeforeChange"), change["fullDocument"])
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            if pre_images and "fullDocumentBeforeChange" in str(e):
+                logger.warning("Live feed change stream without pre-images: %s", e)
+                pre_images = False
+                continue
+            logger.warning("Live feed change stream interrupted (%s), retrying in %ss", e, retry_seconds)
+            await asyncio.sleep(retry_seconds)
+        except PyMongoError as e:
+            logger.warning("Live feed change stream interrupted (%s), retrying in %ss", e, retry_seconds)
+            await asyncio.sleep(retry_seconds)
@@ -0,0 +1,239 @@
+"""Request latency, MongoDB command and connection pool metrics"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+from pymongo import monitoring
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative histogram per label set.
+
+    Observations come from the event loop (requests) and from the driver's
+    worker threads (Mongo commands), so updates are serialized by a lock.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One count per bucket plus +Inf, then the running sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trips by collection, command and outcome.",
+    ("collection", "command", "outcome"),
+    MONGO_BUCKETS,
+)
+
+
+def render() -> str:
+    return REQUEST_LATENCY.render() + MONGO_COMMAND_DURATION.render()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request until its last body chunk.
+
+    Requests are labelled by route template (/api/matches/{match_id}), not
+    by path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                (scope["method"], getattr(route, "path", "unmatched"), str(status)),
+                time.perf_counter() - start,
+            )
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Record the duration of every command the driver sends, per collection"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return (event.connection_id, event.request_id, event.operation_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = "-"
+        with self._lock:
+            self._pending[self._key(event)] = (collection, event.command_name)
+
+    def _finish(self, event, outcome: str):
+        with self._lock:
+            collection, command = self._pending.pop(self._key(event), ("-", event.command_name))
+        MONGO_COMMAND_DURATION.observe((collection, command, outcome), event.duration_micros / 1_000_000)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Live connection pool figures per server, from the driver's pool events"""
+
+    def __init__(self):
+        self._pools: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, event) -> dict:
+        address = "%s:%s" % event.address
+        pool = self._pools.get(address)
+        if pool is None:
+            pool = self._pools[address] = {
+                "ready": False, "open": 0, "in_use": 0, "waiting": 0,
+                "checkout_failures": {}, "cleared": 0,
+            }
+        return pool
+
+    def _update(self, event, **changes):
+        with self._lock:
+            pool = self._pool(event)
+            for field, change in changes.items():
+                pool[field] += change
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event)
+
+    def pool_ready(self, event):
+        with self._lock:
+            self._pool(event)["ready"] = True
+
+    def pool_cleared(self, event):
+        with self._lock:
+            pool = self._pool(event)
+            pool["ready"] = False
+            pool["cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        self._update(event, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event)
+            pool["waiting"] -= 1
+            failures = pool["checkout_failures"]
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        self._update(event, waiting=-1, in_use=1)
+
+    def connection_checked_in(self, event):
+        self._update(event, in_use=-1)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                address: {**pool, "checkout_failures": dict(pool["checkout_failures"])}
+                for address, pool in self._pools.items()
+            }
+
+    def render(self) -> str:
+        pools = sorted(self.snapshot().items())
+        lines = []
+        for field, documentation in (
+            ("open", "Open connections per server."),
+            ("in_use", "Connections checked out per server."),
+            ("waiting", "Operations waiting for a connection per server."),
+        ):
+            name = f"mongodb_pool_{field}_connections"
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{_format_labels(('address',), (address,))} {pool[field]}" for address, pool in pools]
+        name = "mongodb_pool_checkout_failures_total"
+        lines += [f"# HELP {name} Failed connection checkouts per server and reason.", f"# TYPE {name} counter"]
+        for address, pool in pools:
+            for reason, count in sorted(pool["checkout_failures"].items()):
+                lines.append(f"{name}{_format_labels(('address', 'reason'), (address, reason))} {count}")
+        return "\n".join(lines) + "\n"
@@ -1,29 +1,149 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReadPreference, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+import io
+import asyncio
 import os
+import csv
+import json
+import base64
+import contextlib
+import contextvars
+import hashlib
 import logging
+import time
+import orjson
+from functools import lru_cache
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
+import analytics
+from live_feed import LiveFeed, watch_match_changes
+from write_behind import WriteBehindBuffer
+import metrics
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+
+# Connection pool and timeouts, per worker process. Size the pool so that
+# workers x MONGO_MAX_POOL_SIZE stays within the server's connection limit;
+# MONGO_WAIT_QUEUE_TIMEOUT_MS bounds how long a request waits for a free
+# connection instead of queueing behind an exhausted pool (unset: no limit).
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ['MONGO_WAIT_QUEUE_TIMEOUT_MS']) if os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS') else None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000'))
+
+READ_PREFERENCES = {
+    preference.mongos_mode: preference
+    for preference in (
+        ReadPreference.PRIMARY,
+        ReadPreference.PRIMARY_PREFERRED,
+        ReadPreference.SECONDARY,
+        ReadPreference.SECONDARY_PREFERRED,
+        ReadPreference.NEAREST,
+    )
+}
+
+def parse_read_preference(name: str):
+    try:
+        return READ_PREFERENCES[name.strip()]
+    except KeyError:
+        raise ValueError(f"Unknown read preference {name!r}, expected one of {', '.join(READ_PREFERENCES)}")
+
+def parse_route_read_preferences(value: str) -> Dict[str, Any]:
+    """"rankings=secondaryPreferred,export=secondary" -> {"rankings": SecondaryPreferred, ...}"""
+    preferences = {}
+    for entry in filter(None, (entry.strip() for entry in value.split(","))):
+        route, _, name = entry.partition("=")
+        preferences[route.strip().strip("/")] = parse_read_preference(name)
+    return preferences
+
+# Default read preference, and overrides for GET requests keyed by the
+# first path segment after /api (e.g. rankings, export, news). Responses
+# kept in the response cache are always built from the primary, so the
+# overrides only apply to the uncached reads of those routes.
+MONGO_READ_PREFERENCE = parse_read_preference(os.environ.get('MONGO_READ_PREFERENCE', 'primary'))
+MONGO_ROUTE_READ_PREFERENCES = parse_route_read_preferences(os.environ.get('MONGO_ROUTE_READ_PREFERENCES', ''))
+
+pool_stats = metrics.PoolStats()
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    read_preference=MONGO_READ_PREFERENCE,
+    event_listeners=[metrics.MongoCommandListener(), pool_stats],
+)
+
+# Read preference of the request being served, set by route_read_preference
+request_read_preference = contextvars.ContextVar('request_read_preference', default=None)
+
+class RoutedDatabase:
+    """The app database, whose collections read with the current route's read preference"""
+
+    def __init__(self, database):
+        self._database = database
+        self._collections: Dict[Tuple[str, str], AsyncIOMotorCollection] = {}
+
+    def _route(self, name: str, value):
+        preference = request_read_preference.get()
+        if preference is None or not isinstance(value, AsyncIOMotorCollection):
+            return value
+        key = (name, preference.mongos_mode)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = self._collections[key] = value.with_options(read_preference=preference)
+        return collection
+
+    def __getattr__(self, name: str):
+        return self._route(name, getattr(self._database, name))
+
+    def __getitem__(self, name: str):
+        return self._route(name, self._database[name])
+
+db = RoutedDatabase(client[os.environ['DB_NAME']])
+
+async def route_read_preference(request: Request):
+    """Pick the read preference for this request; writes always go to the primary"""
+    preference = None
+    if request.method == "GET" and MONGO_ROUTE_READ_PREFERENCES:
+        segment = request.url.path.removeprefix("/api/").split("/", 1)[0]
+        preference = MONGO_ROUTE_READ_PREFERENCES.get(segment)
+    request_read_preference.set(preference)
+
+# Live score feed: "local" publishes from this process, "change_stream"
+# follows MongoDB so every worker sees writes made by the others
+LIVE_FEED_SOURCE = os.environ.get('LIVE_FEED_SOURCE', 'local')
+live_feed = LiveFeed()
+
+# Write-behind window for updates to LIVE matches, in milliseconds (0 disables).
+# The buffer is per process: run a single worker, or route a match's scorers
+# to the same one, when enabling it.
+LIVE_WRITE_BEHIND_MS = int(os.environ.get('LIVE_WRITE_BEHIND_MS', '0'))
+
+# In-process caches are invalidated by this worker's own writes, and expire
+# after CACHE_MAX_AGE seconds so writes handled by other workers show up too
+CACHE_MAX_AGE = float(os.environ.get('CACHE_MAX_AGE', '5'))
 
 # Create the main app without a prefix
 app = FastAPI()
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", dependencies=[Depends(route_read_preference)])
 
 # Enums
 class MatchStatus(str, Enum):
@@ -32,6 +152,23 @@ class MatchStatus(str, Enum):
     FINISHED = "finished"
     CANCELLED = "cancelled"
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class ExportResource(str, Enum):
+    TEAMS = "teams"
+    MATCHES = "matches"
+    STANDINGS = "standings"
+
+class VenuePolicy(str, Enum):
+    HOME_CITY = "home_city"
+    FIXED = "fixed"
+
+class ListView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
 # Models
 class Team(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -49,8 +186,32 @@ class TeamCreate(BaseModel):
     city: str
     players_count: Optional[int] = 0
 
+class Season(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    start_date: datetime
+    end_date: datetime
+    is_current: bool = False
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class SeasonCreate(BaseModel):
+    name: str
+    start_date: datetime
+    end_date: datetime
+    is_current: bool = False
+
+class Competition(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class CompetitionCreate(BaseModel):
+    name: str
+
 class Match(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    season_id: Optional[str] = None
+    competition_id: Optional[str] = None
     home_team_id: str
     away_team_id: str
     home_team_score: Optional[int] = None
@@ -61,21 +222,62 @@ class Match(BaseModel):
     referee: Optional[str] = None
     attendance: Optional[int] = None
     notes: Optional[str] = None
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class MatchSummary(BaseModel):
+    id: str
+    season_id: Optional[str] = None
+    competition_id: Optional[str] = None
+    home_team_id: str
+    away_team_id: str
+    home_team_score: Optional[int] = None
+    away_team_score: Optional[int] = None
+    match_date: datetime
+    venue: str
+    status: MatchStatus
+
 class MatchCreate(BaseModel):
+    season_id: Optional[str] = None
+    competition_id: Optional[str] = None
     home_team_id: str
     away_team_id: str
     match_date: datetime
     venue: str
     referee: Optional[str] = None
 
+class ScheduleRequest(BaseModel):
+    team_ids: List[str]
+    start_date: datetime
+    interval_days: int = Field(7, ge=1)
+    venue_policy: VenuePolicy = VenuePolicy.HOME_CITY
+    venue: Optional[str] = None
+    double_round: bool = True
+    season_id: Optional[str] = None
+    competition_id: Optional[str] = None
+
 class MatchUpdate(BaseModel):
     home_team_score: Optional[int] = None
     away_team_score: Optional[int] = None
     status: Optional[MatchStatus] = None
     attendance: Optional[int] = None
     notes: Optional[str] = None
+    # Version the client last read: the update is rejected if the match changed since
+    version: Optional[int] = None
+
+class TeamPosition(BaseModel):
+    date: datetime
+    position: int
+    played: int
+    points: int
+
+class BulkImportError(BaseModel):
+    index: int
+    detail: Any
+
+class BulkImportResult(BaseModel):
+    inserted: int = 0
+    errors: List[BulkImportError] = []
 
 class Ranking(BaseModel):
     team_id: str
@@ -89,6 +291,26 @@ class Ranking(BaseModel):
     goal_difference: int = 0
     points: int = 0
     position: int = 0
+    form: str = ""
+
+class TeamFixture(BaseModel):
+    id: str
+    match_date: datetime
+    venue: str
+    status: MatchStatus
+    is_home: bool
+    opponent_id: str
+    opponent_name: Optional[str] = None
+    team_score: Optional[int] = None
+    opponent_score: Optional[int] = None
+    result: Optional[str] = None
+
+class TeamSummary(BaseModel):
+    team: Team
+    season_id: Optional[str] = None
+    standing: Optional[Ranking] = None
+    recent: List[TeamFixture] = []
+    upcoming: List[TeamFixture] = []
 
 class News(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -97,100 +319,1310 @@ class News(BaseModel):
     author: str
     image_url: Optional[str] = None
     published: bool = True
+    season_id: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class NewsSummary(BaseModel):
+    id: str
+    title: str
+    excerpt: str
+    author: str
+    image_url: Optional[str] = None
+    created_at: datetime
+
+class MatchCard(BaseModel):
+    id: str
+    home_team_id: str
+    away_team_id: str
+    home_team_name: Optional[str] = None
+    away_team_name: Optional[str] = None
+    home_team_score: Optional[int] = None
+    away_team_score: Optional[int] = None
+    match_date: datetime
+    venue: str
+    status: MatchStatus
+
+class HomePage(BaseModel):
+    stats: Dict[str, Any]
+    next_matches: List[MatchCard] = []
+    recent_matches: List[MatchCard] = []
+    news: List[NewsSummary] = []
+
+class NewsSearchHit(NewsSummary):
+    score: float
+
+class HomeAdvantage(BaseModel):
+    matches: int = 0
+    home_win_share: float = 0.0
+    draw_share: float = 0.0
+    away_win_share: float = 0.0
+    home_goals_per_match: float = 0.0
+    away_goals_per_match: float = 0.0
+    home_points_per_match: float = 0.0
+    away_points_per_match: float = 0.0
+
+class GoalsBucket(BaseModel):
+    goals: int
+    matches: int
+    share: float
+
+class GoalsDistribution(BaseModel):
+    mean: float = 0.0
+    median: float = 0.0
+    std: float = 0.0
+    over_2_5_share: float = 0.0
+    both_teams_scored_share: float = 0.0
+    buckets: List[GoalsBucket] = []
+
+class TeamAnalytics(BaseModel):
+    team_id: str
+    team_name: str
+    played: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    clean_sheets: int = 0
+    home_clean_sheets: int = 0
+    away_clean_sheets: int = 0
+    longest_scoring_streak: int = 0
+    current_scoring_streak: int = 0
+    longest_scoreless_streak: int = 0
+    attack_strength: float = 0.0
+    defence_strength: float = 0.0
+
+class SeasonAnalytics(BaseModel):
+    season_id: Optional[str] = None
+    matches: int = 0
+    home_advantage: HomeAdvantage
+    goals_distribution: GoalsDistribution
+    teams: List[TeamAnalytics] = []
+
 class NewsCreate(BaseModel):
     title: str
     content: str
     author: str
     image_url: Optional[str] = None
     published: bool = True
+    season_id: Optional[str] = None
 
 # Helper functions
-async def calculate_rankings():
-    """Calculate team rankings based on finished matches"""
-    teams = await db.teams.find().to_list(1000)
-    rankings = []
+def rankings_pipeline(season_id: Optional[str] = None) -> list:
+    """Per-team totals over the matches of one season (None: matches without a season)"""
+    counted = {"$and": [
+        {"$eq": ["$status", MatchStatus.FINISHED.value]},
+        {"$ne": [{"$ifNull": ["$home_team_score", None]}, None]},
+        {"$ne": [{"$ifNull": ["$away_team_score", None]}, None]},
+    ]}
+    home = {"$eq": ["$$side", "home"]}
+    won = {"$gt": ["$side.goals_for", "$side.goals_against"]}
+    drawn = {"$eq": ["$side.goals_for", "$side.goals_against"]}
+    lost = {"$lt": ["$side.goals_for", "$side.goals_against"]}
+    return [
+        # Each match of the season read once; unfinished ones still list their teams
+        {"$match": {"season_id": season_id}},
+        # One row per side of the match
+        {"$project": {
+            "_id": 0,
+            "counted": counted,
+            "side": {"$map": {"input": ["home", "away"], "as": "side", "in": {
+                "team_id": {"$cond": [home, "$home_team_id", "$away_team_id"]},
+                "goals_for": {"$cond": [home, "$home_team_score", "$away_team_score"]},
+                "goals_against": {"$cond": [home, "$away_team_score", "$home_team_score"]},
+            }}},
+        }},
+        {"$unwind": "$side"},
+        {"$group": {
+            "_id": "$side.team_id",
+            "played": {"$sum": {"$cond": ["$counted", 1, 0]}},
+            "won": {"$sum": {"$cond": [{"$and": ["$counted", won]}, 1, 0]}},
+            "drawn": {"$sum": {"$cond": [{"$and": ["$counted", drawn]}, 1, 0]}},
+            "lost": {"$sum": {"$cond": [{"$and": ["$counted", lost]}, 1, 0]}},
+            "goals_for": {"$sum": {"$cond": ["$counted", "$side.goals_for", 0]}},
+            "goals_against": {"$sum": {"$cond": ["$counted", "$side.goals_against", 0]}},
+        }},
+        {"$addFields": {
+            "goal_difference": {"$subtract": ["$goals_for", "$goals_against"]},
+            "points": {"$add": [{"$multiply": ["$won", 3]}, "$drawn"]},
+        }},
+    ]
+
+async def calculate_rankings(season_id: Optional[str] = None):
+    """Calculate team rankings from a single aggregation over the season's matches"""
+    totals = {row["_id"]: row async for row in db.matches.aggregate(rankings_pipeline(season_id))}
+    # Every team is in the unseasoned table; a season's lists those with a fixture in it
+    query = {} if season_id is None else {"id": {"$in": list(totals)}}
     
-    for team in teams:
-        team_ranking = {
+    rankings = []
+    async for team in db.teams.find(query, {"_id": 0, "id": 1, "name": 1}).sort("_id", 1):
+        row = totals.get(team["id"], {})
+        rankings.append({
             "team_id": team["id"],
             "team_name": team["name"],
-            "played": 0,
-            "won": 0,
-            "drawn": 0,
-            "lost": 0,
-            "goals_for": 0,
-            "goals_against": 0,
-            "goal_difference": 0,
-            "points": 0
+            **{field: row.get(field, 0) for field in STANDINGS_FIELDS},
+        })
+    # Sort by points, then goal difference, then goals for (stable: insertion order breaks ties)
+    rankings.sort(key=lambda r: (-r["points"], -r["goal_difference"], -r["goals_for"]))
+    
+    # Add positions
+    for i, ranking in enumerate(rankings):
+        ranking["position"] = i + 1
+    
+    return rankings
+
+STANDINGS_SORT = [("points", -1), ("goal_difference", -1), ("goals_for", -1), ("created_at", 1)]
+STANDINGS_FIELDS = ("played", "won", "drawn", "lost", "goals_for", "goals_against", "goal_difference", "points")
+
+def standings_row(team: dict, season_id: Optional[str] = None) -> dict:
+    """Empty standings row for a team entering a season's table"""
+    row = {"season_id": season_id, "team_id": team["id"], "team_name": team["name"], "created_at": team.get("created_at")}
+    row.update({field: 0 for field in STANDINGS_FIELDS})
+    row["form"] = []
+    return row
+
+def match_contribution(match: Optional[dict]) -> Dict[str, Dict[str, int]]:
+    """Per-team standings counters contributed by a match (empty unless finished and scored)"""
+    if not match or match.get("status") != MatchStatus.FINISHED.value:
+        return {}
+    home_score = match.get("home_team_score")
+    away_score = match.get("away_team_score")
+    if home_score is None or away_score is None:
+        return {}
+    
+    contribution = {}
+    for team_id, gf, ga in (
+        (match["home_team_id"], home_score, away_score),
+        (match["away_team_id"], away_score, home_score),
+    ):
+        contribution[team_id] = {
+            "played": 1,
+            "won": int(gf > ga),
+            "drawn": int(gf == ga),
+            "lost": int(gf < ga),
+            "goals_for": gf,
+            "goals_against": ga,
+            "goal_difference": gf - ga,
+            "points": 3 if gf > ga else 1 if gf == ga else 0,
         }
-        
-        # Get all finished matches for this team
-        matches = await db.matches.find({
-            "$or": [
-                {"home_team_id": team["id"]},
-                {"away_team_id": team["id"]}
-            ],
-            "status": "finished"
-        }).to_list(1000)
-        
-        for match in matches:
-            if match.get("home_team_score") is not None and match.get("away_team_score") is not None:
-                team_ranking["played"] += 1
-                
-                if match["home_team_id"] == team["id"]:
-                    # Team is home
-                    team_ranking["goals_for"] += match["home_team_score"]
-                    team_ranking["goals_against"] += match["away_team_score"]
-                    
-                    if match["home_team_score"] > match["away_team_score"]:
-                        team_ranking["won"] += 1
-                        team_ranking["points"] += 3
-                    elif match["home_team_score"] == match["away_team_score"]:
-                        team_ranking["drawn"] += 1
-                        team_ranking["points"] += 1
-                    else:
-                        team_ranking["lost"] += 1
-                else:
-                    # Team is away
-                    team_ranking["goals_for"] += match["away_team_score"]
-                    team_ranking["goals_against"] += match["home_team_score"]
-                    
-                    if match["away_team_score"] > match["home_team_score"]:
-                        team_ranking["won"] += 1
-                        team_ranking["points"] += 3
-                    elif match["away_team_score"] == match["home_team_score"]:
-                        team_ranking["drawn"] += 1
-                        team_ranking["points"] += 1
-                    else:
-                        team_ranking["lost"] += 1
-        
-        team_ranking["goal_difference"] = team_ranking["goals_for"] - team_ranking["goals_against"]
-        rankings.append(team_ranking)
+    return contribution
+
+def standings_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, Dict[str, int]]:
+    """Non-zero per-team counter changes between a match's old and new state"""
+    deltas: Dict[str, Dict[str, int]] = {}
+    for match, sign in ((before, -1), (after, 1)):
+        for team_id, counters in match_contribution(match).items():
+            team_delta = deltas.setdefault(team_id, {})
+            for field, value in counters.items():
+                team_delta[field] = team_delta.get(field, 0) + sign * value
     
-    # Sort by points, then goal difference, then goals for
-    rankings.sort(key=lambda x: (-x["points"], -x["goal_difference"], -x["goals_for"]))
+    return {
+        team_id: {field: value for field, value in team_delta.items() if value}
+        for team_id, team_delta in deltas.items()
+        if any(team_delta.values())
+    }
+
+def match_season(before: Optional[dict], after: Optional[dict]) -> Optional[str]:
+    return (after or before or {}).get("season_id")
+
+async def ensure_standings_rows(season_id: Optional[str], teams: List[dict]) -> int:
+    """Give teams an empty row in a season's table if missing; returns the number added"""
+    operations = [
+        UpdateOne({"season_id": season_id, "team_id": team["id"]}, {"$setOnInsert": standings_row(team, season_id)}, upsert=True)
+        for team in teams
+    ]
+    if not operations:
+        return 0
+    result = await db.standings.bulk_write(operations, ordered=False)
+    await add_snapshot_rows(season_id, [teams[index] for index in result.upserted_ids])
+    return result.upserted_count
+
+# Recent form: the latest results of each team, kept on its standings row.
+# A few more than displayed are stored so that correcting or deleting a
+# recent match does not leave the ring short.
+FORM_LENGTH = 5
+FORM_BUFFER = 10
+
+def match_result(counters: Dict[str, int]) -> str:
+    return "W" if counters["won"] else "D" if counters["drawn"] else "L"
+
+def form_operations(season_id: Optional[str], before: Optional[dict], after: Optional[dict]) -> list:
+    """Replace a match's entry in both teams' form rings"""
+    match = after or before
+    operations = [
+        UpdateOne({"season_id": season_id, "team_id": team_id}, {"$pull": {"form": {"match_id": match["id"]}}})
+        for team_id in (match["home_team_id"], match["away_team_id"])
+    ]
+    for team_id, counters in match_contribution(after).items():
+        entry = {"match_id": after["id"], "date": after["match_date"], "result": match_result(counters)}
+        operations.append(UpdateOne(
+            {"season_id": season_id, "team_id": team_id},
+            {"$push": {"form": {"$each": [entry], "$sort": {"date": 1}, "$slice": -FORM_BUFFER}}},
+        ))
+    return operations
+
+def form_string(entries: List[dict]) -> str:
+    return "".join(entry["result"] for entry in entries[-FORM_LENGTH:])
+
+def head_to_head_delta(before: Optional[dict], after: Optional[dict]) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """Per (team, opponent) counter changes between a match's old and new state"""
+    deltas: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for match, sign in ((before, -1), (after, 1)):
+        contribution = match_contribution(match)
+        for team_id, counters in contribution.items():
+            opponent_id = match["away_team_id"] if team_id == match["home_team_id"] else match["home_team_id"]
+            pair_delta = deltas.setdefault((team_id, opponent_id), {})
+            for field, value in counters.items():
+                pair_delta[field] = pair_delta.get(field, 0) + sign * value
+    
+    return {
+        pair: {field: value for field, value in pair_delta.items() if value}
+        for pair, pair_delta in deltas.items()
+        if any(pair_delta.values())
+    }
+
+async def apply_standings_delta(before: Optional[dict], after: Optional[dict]):
+    """Move the standings from a match's old state to its new one with $inc deltas"""
+    season_id = match_season(before, after)
+    operations = [
+        UpdateOne({"season_id": season_id, "team_id": team_id}, {"$inc": team_delta})
+        for team_id, team_delta in standings_delta(before, after).items()
+    ]
+    if match_contribution(before) != match_contribution(after):
+        operations += form_operations(season_id, before, after)
+    
+    if operations:
+        # Ordered, so a form entry is pulled before its replacement is pushed
+        await db.standings.bulk_write(operations, ordered=True)
+    
+    pairs = [
+        UpdateOne(
+            {"season_id": season_id, "team_id": team_id, "opponent_id": opponent_id},
+            {"$inc": pair_delta},
+            upsert=True,
+        )
+        for (team_id, opponent_id), pair_delta in head_to_head_delta(before, after).items()
+    ]
+    if pairs:
+        await db.head_to_head.bulk_write(pairs, ordered=False)
+
+def tied_groups(rankings: List[dict]) -> List[List[dict]]:
+    """Consecutive rankings split into groups level on points"""
+    groups: List[List[dict]] = []
+    for ranking in rankings:
+        if groups and groups[-1][0]["points"] == ranking["points"]:
+            groups[-1].append(ranking)
+        else:
+            groups.append([ranking])
+    return groups
+
+def order_tied_groups(groups: List[List[dict]], pairs: Dict[Tuple[str, str], Dict[str, int]]) -> List[dict]:
+    """Order each tied group by the mini-table of its mutual results, then overall record"""
+    group_of = {ranking["team_id"]: i for i, group in enumerate(groups) for ranking in group}
+    mini: Dict[str, List[int]] = {}
+    for (team_id, opponent_id), counters in pairs.items():
+        if team_id in group_of and group_of[team_id] == group_of.get(opponent_id):
+            totals = mini.setdefault(team_id, [0, 0, 0])
+            totals[0] += counters.get("points", 0)
+            totals[1] += counters.get("goal_difference", 0)
+            totals[2] += counters.get("goals_for", 0)
+    
+    ordered = []
+    for group in groups:
+        if len(group) > 1:
+            # sort() is stable: created_at order from the query still breaks full ties
+            group.sort(key=lambda r: (
+                *(-total for total in mini.get(r["team_id"], (0, 0, 0))),
+                -r["goal_difference"], -r["goals_for"],
+            ))
+        ordered.extend(group)
+    return ordered
+
+def add_head_to_head(pairs: Dict[Tuple[str, str], Dict[str, int]], match: dict):
+    """Add a match's result to (team, opponent) head-to-head totals"""
+    for pair, counters in head_to_head_delta(None, match).items():
+        totals = pairs.setdefault(pair, {})
+        for field, value in counters.items():
+            totals[field] = totals.get(field, 0) + value
+
+async def break_ties(season_id: Optional[str], rankings: List[dict], until: Optional[datetime] = None) -> List[dict]:
+    """Order teams level on points by their head-to-head results, then overall record.
+
+    Among tied teams the mini-table of their mutual matches decides
+    (points, goal difference, goals for), before overall goal difference
+    and goals for. Only tied groups are looked up in the pairwise index;
+    for a past table (`until`), in the matches played before that date.
+    """
+    groups = tied_groups(rankings)
+    tied = [ranking["team_id"] for group in groups if len(group) > 1 for ranking in group]
+    if not tied:
+        return rankings
+    
+    pairs: Dict[Tuple[str, str], Dict[str, int]] = {}
+    if until is None:
+        async for pair in db.head_to_head.find(
+            {"season_id": season_id, "team_id": {"$in": tied}, "opponent_id": {"$in": tied}}, {"_id": 0}
+        ):
+            pairs[(pair["team_id"], pair["opponent_id"])] = pair
+    else:
+        async for match in db.matches.find({
+            "season_id": season_id,
+            "status": MatchStatus.FINISHED.value,
+            "home_team_id": {"$in": tied},
+            "away_team_id": {"$in": tied},
+            "match_date": {"$lt": until},
+        }, {"_id": 0}):
+            add_head_to_head(pairs, match)
+    return order_tied_groups(groups, pairs)
+
+async def read_standings(season_id: Optional[str] = None):
+    """Read the materialized standings table of a season in ranking order"""
+    rankings = await db.standings.find(
+        {"season_id": season_id}, {"_id": 0, "created_at": 0, "season_id": 0}
+    ).sort(STANDINGS_SORT).to_list(None)
+    rankings = await break_ties(season_id, rankings)
     
-    # Add positions
     for i, ranking in enumerate(rankings):
         ranking["position"] = i + 1
+        ranking["form"] = form_string(ranking.get("form", []))
     
     return rankings
 
+async def rebuild_standings(season_id: Optional[str] = None):
+    """Recompute a season's standings from matches, replace them and report drift"""
+    expected = await calculate_rankings(season_id)
+    stored = {row["team_id"]: row for row in await db.standings.find({"season_id": season_id}, {"_id": 0}).to_list(None)}
+    created = {team["id"]: team.get("created_at") for team in await db.teams.find({}, {"_id": 0, "id": 1, "created_at": 1}).to_list(None)}
+    
+    drift = []
+    for ranking in expected:
+        row = stored.pop(ranking["team_id"], None)
+        if row is None:
+            drift.append({"team_id": ranking["team_id"], "issue": "missing"})
+            continue
+        fields = {
+            field: {"stored": row.get(field), "expected": ranking[field]}
+            for field in STANDINGS_FIELDS
+            if row.get(field) != ranking[field]
+        }
+        if fields:
+            drift.append({"team_id": ranking["team_id"], "issue": "mismatch", "fields": fields})
+    for team_id in stored:
+        drift.append({"team_id": team_id, "issue": "orphaned"})
+    
+    rows = []
+    for ranking in expected:
+        row = {key: ranking[key] for key in ("team_id", "team_name") + STANDINGS_FIELDS}
+        row["season_id"] = season_id
+        row["created_at"] = created.get(ranking["team_id"])
+        rows.append(row)
+    
+    await db.standings.delete_many({"season_id": season_id})
+    if rows:
+        await db.standings.insert_many(rows)
+    await rebuild_form_and_head_to_head(season_id)
+    
+    return {"teams": len(rows), "drift": drift}
+
+async def rebuild_form_and_head_to_head(season_id: Optional[str] = None):
+    """Replay a season's finished matches into the form rings and the pairwise index"""
+    forms: Dict[str, List[dict]] = {}
+    pairs: Dict[Tuple[str, str], Dict[str, int]] = {}
+    cursor = db.matches.find({"season_id": season_id, "status": MatchStatus.FINISHED.value}, {"_id": 0})
+    async for match in cursor.sort("match_date", 1):
+        for (team_id, opponent_id), counters in head_to_head_delta(None, match).items():
+            totals = pairs.setdefault((team_id, opponent_id), {field: 0 for field in STANDINGS_FIELDS})
+            for field, value in counters.items():
+                totals[field] += value
+        for team_id, counters in match_contribution(match).items():
+            form = forms.setdefault(team_id, [])
+            form.append({"match_id": match["id"], "date": match["match_date"], "result": match_result(counters)})
+            del form[:-FORM_BUFFER]
+    
+    await db.standings.update_many({"season_id": season_id}, {"$set": {"form": []}})
+    if forms:
+        await db.standings.bulk_write([
+            UpdateOne({"season_id": season_id, "team_id": team_id}, {"$set": {"form": form}})
+            for team_id, form in forms.items()
+        ], ordered=False)
+    
+    await db.head_to_head.delete_many({"season_id": season_id})
+    if pairs:
+        await db.head_to_head.insert_many([
+            {"season_id": season_id, "team_id": team_id, "opponent_id": opponent_id, **totals}
+            for (team_id, opponent_id), totals in pairs.items()
+        ])
+
+# Standings history
+# One cumulative row per team and matchday date, moved with the same
+# deltas as the live standings so past tables never need replaying.
+def matchday_date(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+def _empty_row(row: dict, season_id: Optional[str]) -> dict:
+    empty = standings_row({"id": row["team_id"], "name": row["team_name"], "created_at": row.get("created_at")}, season_id)
+    del empty["form"]
+    return empty
+
+async def ensure_snapshot(season_id: Optional[str], day: datetime):
+    """Create the table for a matchday date by carrying the previous one forward"""
+    if await db.standings_history.find_one({"season_id": season_id, "date": day}, {"_id": 1}):
+        return
+    
+    rows = {}
+    previous = await db.standings_history.find_one(
+        {"season_id": season_id, "date": {"$lt": day}}, {"_id": 0, "date": 1}, sort=[("date", -1)]
+    )
+    if previous:
+        async for row in db.standings_history.find({"season_id": season_id, "date": previous["date"]}, {"_id": 0}):
+            rows[row["team_id"]] = row
+    async for team in db.standings.find({"season_id": season_id}, {"_id": 0, "team_id": 1, "team_name": 1, "created_at": 1}):
+        rows.setdefault(team["team_id"], _empty_row(team, season_id))
+    for row in rows.values():
+        row.pop("form", None)
+    
+    if rows:
+        try:
+            await db.standings_history.insert_many([{**row, "date": day} for row in rows.values()], ordered=False)
+        except BulkWriteError:
+            # Another write created the same matchday concurrently
+            pass
+
+async def add_snapshot_rows(season_id: Optional[str], teams: List[dict]):
+    """Give teams joining a season's table an empty row on its recorded matchdays.
+
+    Later results are applied to existing matchdays with $inc, which would
+    otherwise match nothing for a team missing from them.
+    """
+    if not teams:
+        return
+    days = await db.standings_history.distinct("date", {"season_id": season_id})
+    rows = []
+    for team in teams:
+        row = standings_row(team, season_id)
+        del row["form"]
+        rows.extend({**row, "date": day} for day in days)
+    if rows:
+        try:
+            await db.standings_history.insert_many(rows, ordered=False)
+        except BulkWriteError:
+            # Rows carried into a matchday created concurrently
+            pass
+
+async def record_snapshot_delta(before: Optional[dict], after: Optional[dict]):
+    """Apply a match's standings change to its matchday and every later one"""
+    season_id = match_season(before, after)
+    days: Dict[datetime, Dict[str, Dict[str, int]]] = {}
+    for match, sign in ((before, -1), (after, 1)):
+        for team_id, counters in match_contribution(match).items():
+            team_delta = days.setdefault(matchday_date(match["match_date"]), {}).setdefault(team_id, {})
+            for field, value in counters.items():
+                team_delta[field] = team_delta.get(field, 0) + sign * value
+    
+    for day in sorted(days):
+        operations = []
+        for team_id, team_delta in days[day].items():
+            team_delta = {field: value for field, value in team_delta.items() if value}
+            if team_delta:
+                operations.append(UpdateMany(
+                {"season_id": season_id, "team_id": team_id, "date": {"$gte": day}}, {"$inc": team_delta}
+            ))
+        if operations:
+            await ensure_snapshot(season_id, day)
+            await db.standings_history.bulk_write(operations, ordered=False)
+
+async def snapshot_date(
+    season_id: Optional[str], as_of: Optional[datetime] = None, matchday: Optional[int] = None
+) -> Optional[datetime]:
+    """The recorded matchday date in effect on a date (inclusive), or of the Nth matchday"""
+    if matchday is not None:
+        dates = sorted(await db.standings_history.distinct("date", {"season_id": season_id}))
+        return dates[matchday - 1] if matchday <= len(dates) else None
+    
+    latest = await db.standings_history.find_one(
+        {"season_id": season_id, "date": {"$lte": as_of}}, {"_id": 0, "date": 1}, sort=[("date", -1)]
+    )
+    return latest["date"] if latest else None
+
+async def read_snapshot(season_id: Optional[str], day: Optional[datetime]) -> List[dict]:
+    """A season's table after the matchday recorded on `day` (empty without one)"""
+    if day is None:
+        return []
+    
+    rankings = await db.standings_history.find(
+        {"season_id": season_id, "date": day}, {"_id": 0, "created_at": 0, "date": 0, "season_id": 0}
+    ).sort(STANDINGS_SORT).to_list(None)
+    # Same tie-breakers as the live table, on the mutual results known that day
+    rankings = await break_ties(season_id, rankings, until=day + timedelta(days=1))
+    for i, ranking in enumerate(rankings):
+        ranking["position"] = i + 1
+    return rankings
+
+async def position_history(team_id: str, season_id: Optional[str]) -> List[dict]:
+    """Position and points of a team after every recorded matchday of a season"""
+    days: Dict[datetime, List[dict]] = {}
+    cursor = db.standings_history.find(
+        {"season_id": season_id},
+        {"_id": 0, "date": 1, "team_id": 1, "played": 1, "points": 1, "goal_difference": 1, "goals_for": 1},
+    ).sort([("date", 1)] + STANDINGS_SORT)
+    async for row in cursor:
+        days.setdefault(row["date"], []).append(row)
+    
+    # Ties are broken as in read_snapshot: head-to-head totals are accumulated
+    # along the season's results, in one pass over its finished matches
+    matches = []
+    if any(len(group) > 1 for rows in days.values() for group in tied_groups(rows)):
+        matches = await db.matches.find(
+            {"season_id": season_id, "status": MatchStatus.FINISHED.value},
+            {"_id": 0, "id": 1, "home_team_id": 1, "away_team_id": 1, "home_team_score": 1, "away_team_score": 1, "status": 1, "match_date": 1},
+        ).sort("match_date", 1).to_list(None)
+    pairs: Dict[Tuple[str, str], Dict[str, int]] = {}
+    played = 0
+    
+    history = []
+    for day, rows in days.items():
+        while played < len(matches) and matchday_date(matches[played]["match_date"]) <= day:
+            add_head_to_head(pairs, matches[played])
+            played += 1
+        for position, row in enumerate(order_tied_groups(tied_groups(rows), pairs), start=1):
+            if row["team_id"] == team_id:
+                history.append({"date": day, "position": position, "played": row["played"], "points": row["points"]})
+    return history
+
+async def rebuild_snapshots(season_id: Optional[str] = None) -> int:
+    """Replay a season's finished matches in date order into fresh matchday tables"""
+    totals = {}
+    cursor = db.standings.find({"season_id": season_id}, {"_id": 0, "team_id": 1, "team_name": 1, "created_at": 1})
+    async for team in cursor.sort("created_at", 1):
+        totals[team["team_id"]] = _empty_row(team, season_id)
+    
+    snapshots = []
+    current_day = None
+    cursor = db.matches.find({"season_id": season_id, "status": MatchStatus.FINISHED.value}, {"_id": 0}).sort("match_date", 1)
+    async for match in cursor:
+        day = matchday_date(match["match_date"])
+        if current_day is not None and day != current_day:
+            snapshots.extend({**row, "date": current_day} for row in totals.values())
+        current_day = day
+        for team_id, counters in match_contribution(match).items():
+            if team_id in totals:
+                for field, value in counters.items():
+                    totals[team_id][field] += value
+    if current_day is not None:
+        snapshots.extend({**row, "date": current_day} for row in totals.values())
+    
+    await db.standings_history.delete_many({"season_id": season_id})
+    if snapshots:
+        await db.standings_history.insert_many(snapshots)
+    return len({snapshot["date"] for snapshot in snapshots})
+
+def round_robin_rounds(team_ids: List[str], double_round: bool = True) -> List[List[Tuple[str, str]]]:
+    """(home, away) pairings per matchday from the canonical round-robin factorization.
+
+    Home and away alternate so that each team has at most one break (two
+    consecutive home or away games) per half-season. The return legs
+    mirror the first half. With an odd number of teams one team rests
+    each matchday.
+    """
+    teams: List[Optional[str]] = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    fixed = teams[-1]
+    
+    rounds = []
+    for r in range(n - 1):
+        pairs = [(fixed, teams[r]) if r % 2 else (teams[r], fixed)]
+        for k in range(1, n // 2):
+            a, b = teams[(r + k) % (n - 1)], teams[(r - k) % (n - 1)]
+            pairs.append((a, b) if k % 2 else (b, a))
+        rounds.append([(home, away) for home, away in pairs if home is not None and away is not None])
+    
+    if double_round:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+# Dashboard counters
+# One document per season, maintained with $inc on every team and match
+# write, so the dashboard reads it instead of counting whole collections
+DASHBOARD_COUNTERS_ID = "dashboard"
+STATUS_COUNTERS = {
+    MatchStatus.SCHEDULED.value: "upcoming_matches",
+    MatchStatus.LIVE.value: "live_matches",
+    MatchStatus.FINISHED.value: "finished_matches",
+    MatchStatus.CANCELLED.value: "cancelled_matches",
+}
+DASHBOARD_COUNTERS = ("teams_count", "matches_count", *STATUS_COUNTERS.values(), "goals_scored")
+
+def match_counters(match: Optional[dict]) -> Dict[str, int]:
+    """Dashboard counters contributed by one match"""
+    if not match:
+        return {}
+    counters = {"matches_count": 1, STATUS_COUNTERS[match["status"]]: 1}
+    if match["status"] in (MatchStatus.LIVE.value, MatchStatus.FINISHED.value):
+        counters["goals_scored"] = (match.get("home_team_score") or 0) + (match.get("away_team_score") or 0)
+    return counters
+
+def counters_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, int]:
+    delta = dict(match_counters(after))
+    for field, value in match_counters(before).items():
+        delta[field] = delta.get(field, 0) - value
+    return {field: value for field, value in delta.items() if value}
+
+def counters_id(season_id: Optional[str]) -> str:
+    return DASHBOARD_COUNTERS_ID if season_id is None else f"{DASHBOARD_COUNTERS_ID}:{season_id}"
+
+async def inc_counters(delta: Dict[str, int], season_id: Optional[str] = None):
+    if delta:
+        await db.counters.update_one({"_id": counters_id(season_id)}, {"$inc": delta}, upsert=True)
+
+async def rebuild_counters(season_id: Optional[str] = None) -> dict:
+    """Recount a season's dashboard counters from the collections"""
+    counters = {field: 0 for field in DASHBOARD_COUNTERS}
+    counters["teams_count"] = await db.standings.count_documents({"season_id": season_id})
+    cursor = db.matches.find({"season_id": season_id}, {"_id": 0, "status": 1, "home_team_score": 1, "away_team_score": 1})
+    async for match in cursor:
+        for field, value in match_counters(match).items():
+            counters[field] += value
+    
+    await db.counters.replace_one({"_id": counters_id(season_id)}, counters, upsert=True)
+    return counters
+
+# Indexes
+# Every index the routes rely on, created at startup when missing
+INDEXES = {
+    "teams": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+    ],
+    "seasons": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "competitions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "matches": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("home_team_id", ASCENDING), ("status", ASCENDING)], name="home_team_id_status"),
+        IndexModel([("away_team_id", ASCENDING), ("status", ASCENDING)], name="away_team_id_status"),
+        IndexModel([("season_id", ASCENDING), ("status", ASCENDING), ("match_date", ASCENDING)], name="season_id_status_match_date"),
+        IndexModel([("season_id", ASCENDING), ("match_date", ASCENDING), ("id", ASCENDING)], name="season_id_match_date_id"),
+        IndexModel([("season_id", ASCENDING), ("home_team_id", ASCENDING), ("match_date", ASCENDING)], name="season_id_home_team_id_match_date"),
+        IndexModel([("season_id", ASCENDING), ("away_team_id", ASCENDING), ("match_date", ASCENDING)], name="season_id_away_team_id_match_date"),
+        IndexModel([("season_id", ASCENDING), ("venue", ASCENDING), ("match_date", ASCENDING)], name="season_id_venue_match_date"),
+        IndexModel(
+            [("season_id", ASCENDING), ("competition_id", ASCENDING), ("match_date", ASCENDING), ("id", ASCENDING)],
+            name="season_id_competition_id_match_date_id",
+        ),
+    ],
+    "news": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("published", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="published_created_at_id"),
+        IndexModel(
+            [("season_id", ASCENDING), ("published", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="season_id_published_created_at_id",
+        ),
+        # French stemming; text indexes (v3) also ignore case and diacritics
+        IndexModel(
+            [("title", TEXT), ("content", TEXT)],
+            name="title_content_text",
+            default_language="french",
+            weights={"title": 3, "content": 1},
+        ),
+    ],
+    "standings": [
+        IndexModel([("season_id", ASCENDING), ("team_id", ASCENDING)], name="season_id_team_id_unique", unique=True),
+        IndexModel(
+            [
+                ("season_id", ASCENDING), ("points", DESCENDING), ("goal_difference", DESCENDING),
+                ("goals_for", DESCENDING), ("created_at", ASCENDING),
+            ],
+            name="season_id_ranking_order",
+        ),
+    ],
+    "head_to_head": [
+        IndexModel(
+            [("season_id", ASCENDING), ("team_id", ASCENDING), ("opponent_id", ASCENDING)],
+            name="season_id_team_id_opponent_id_unique",
+            unique=True,
+        ),
+    ],
+    "standings_history": [
+        IndexModel([("season_id", ASCENDING), ("date", ASCENDING), ("team_id", ASCENDING)], name="season_id_date_team_id_unique", unique=True),
+        IndexModel([("season_id", ASCENDING), ("team_id", ASCENDING), ("date", ASCENDING)], name="season_id_team_id_date"),
+    ],
+}
+
+def _existing_index(index: IndexModel, existing: dict) -> Optional[dict]:
+    """The existing index with the same name or key pattern, if any"""
+    if index.document["name"] in existing:
+        return existing[index.document["name"]]
+    keys = list(index.document["key"].items())
+    return next((info for info in existing.values() if list(info["key"]) == keys), None)
+
+def _index_mismatch(index: IndexModel, info: dict) -> List[str]:
+    """Options of an existing index that differ from the expected ones"""
+    expected = index.document
+    mismatch = []
+    if bool(info.get("unique", False)) != bool(expected.get("unique", False)):
+        mismatch.append("unique")
+    # Text index options, which mongod always reports for text indexes
+    for option in ("weights", "default_language"):
+        if option in expected and option in info and info[option] != expected[option]:
+            mismatch.append(option)
+    return mismatch
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """Create the missing indexes and return their names per collection"""
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        # Indexes existing with other options are reported by index_status, not replaced
+        missing = [index for index in indexes if _existing_index(index, existing) is None]
+        if not missing:
+            continue
+        try:
+            created[collection_name] = await collection.create_indexes(missing)
+        except OperationFailure as e:
+            logger.error("Could not create indexes on %s: %s", collection_name, e)
+    return created
+
+async def index_status() -> Dict[str, List[dict]]:
+    """Compare the expected indexes with those present on each collection"""
+    status = {}
+    for collection_name, indexes in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        status[collection_name] = []
+        for index in indexes:
+            info = _existing_index(index, existing)
+            mismatch = _index_mismatch(index, info) if info is not None else []
+            status[collection_name].append({
+                "name": index.document["name"],
+                "keys": dict(index.document["key"]),
+                "unique": index.document.get("unique", False),
+                # Present only with the expected options; mismatch lists those that differ
+                "present": info is not None and not mismatch,
+                "mismatch": mismatch,
+            })
+    return status
+
+# Keyset pagination
+PAGE_SIZE = 1000
+
+def encode_cursor(doc: dict, field: str) -> str:
+    """Opaque cursor pointing just after a document in (field, id) order"""
+    value = doc[field]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, doc["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, parse: Callable[[Any], Any] = datetime.fromisoformat) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, doc_id = json.loads(raw)
+        return parse(value), str(doc_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+def keyset_query(query: dict, field: str, direction: int, after: Optional[str]) -> dict:
+    """Restrict a query to the documents after a cursor in (field, id) order"""
+    if not after:
+        return query
+    value, doc_id = decode_cursor(after)
+    op = "$gt" if direction == ASCENDING else "$lt"
+    return {"$and": [query, {"$or": [{field: {op: value}}, {field: value, "id": {op: doc_id}}]}]}
+
+async def fetch_page(
+    collection, query: dict, field: str, direction: int, limit: int, after: Optional[str], response: Response,
+    projection: Optional[dict] = None,
+) -> List[dict]:
+    """Fetch one page in (field, id) order and expose the next cursor in X-Next-Cursor"""
+    query = keyset_query(query, field, direction, after)
+    docs = await collection.find(query, projection).sort([(field, direction), ("id", direction)]).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1], field)
+    return docs
+
+# Projections
+NEWS_EXCERPT_LENGTH = 150
+
+MATCH_SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in MatchSummary.model_fields}}
+NEWS_SUMMARY_PROJECTION = {
+    "_id": 0,
+    **{field: 1 for field in NewsSummary.model_fields if field != "excerpt"},
+    "excerpt": {"$substrCP": ["$content", 0, NEWS_EXCERPT_LENGTH]},
+}
+
+def fields_projection(fields: str, model, keyset_field: str) -> dict:
+    """Mongo projection for a comma-separated field list (id and the paging key are always kept)"""
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champs inconnus : {', '.join(unknown)}")
+    return {"_id": 0, "id": 1, keyset_field: 1, **{field: 1 for field in requested}}
+
+# Serialization
+# List endpoints bypass response_model: building one model per document and
+# having FastAPI validate and encode it again doubles the work on large pages.
+@lru_cache(maxsize=None)
+def list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def json_response(body: bytes, response: Response) -> Response:
+    """Send an encoded JSON body, keeping the pagination header"""
+    headers = {}
+    if "X-Next-Cursor" in response.headers:
+        headers["X-Next-Cursor"] = response.headers["X-Next-Cursor"]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def model_list_response(model, docs: List[dict], response: Response) -> Response:
+    """Validate a page of documents against the model in one call and encode it in one pass"""
+    adapter = list_adapter(model)
+    return json_response(adapter.dump_json(adapter.validate_python(docs)), response)
+
+def projected_response(items: List[dict], response: Response) -> Response:
+    """Serialize projected documents directly, keeping the pagination header"""
+    return json_response(orjson.dumps(items), response)
+
+# Bulk import
+BULK_BATCH_SIZE = 500
+
+async def iter_bulk_records(request: Request):
+    """Yield (index, record, error) from a JSON array body or an NDJSON stream"""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *_parse_ndjson_line(line))
+                    index += 1
+        if buffer.strip():
+            yield (index, *_parse_ndjson_line(buffer))
+        return
+    
+    try:
+        records = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corps JSON invalide")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Un tableau JSON ou un flux NDJSON est attendu")
+    for index, record in enumerate(records):
+        yield index, record, None
+
+def _parse_ndjson_line(line: bytes):
+    try:
+        return json.loads(line), None
+    except ValueError:
+        return None, "Ligne JSON invalide"
+
+async def iter_bulk_batches(request: Request, model):
+    """Group validated records into batches, collecting per-record errors in the result"""
+    result = BulkImportResult()
+    batch = []
+    async for index, record, error in iter_bulk_records(request):
+        if error is None:
+            try:
+                if not isinstance(record, dict):
+                    raise TypeError
+                batch.append((index, model(**record)))
+            except ValidationError as e:
+                error = [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]
+            except TypeError:
+                error = "Un objet JSON est attendu"
+        if error is not None:
+            result.errors.append(BulkImportError(index=index, detail=error))
+        if len(batch) >= BULK_BATCH_SIZE:
+            yield result, batch
+            batch = []
+    yield result, batch
+
+async def insert_batch(collection, indexed_docs: List[Tuple[int, dict]], result: BulkImportResult) -> List[dict]:
+    """Unordered insert_many of a batch, mapping write errors back to record indexes"""
+    if not indexed_docs:
+        return []
+    try:
+        await collection.insert_many([doc for _, doc in indexed_docs], ordered=False)
+        failed = set()
+    except BulkWriteError as e:
+        failed = set()
+        for err in e.details["writeErrors"]:
+            failed.add(err["index"])
+            result.errors.append(BulkImportError(index=indexed_docs[err["index"]][0], detail=err["errmsg"]))
+    
+    inserted = [doc for i, (_, doc) in enumerate(indexed_docs) if i not in failed]
+    result.inserted += len(inserted)
+    return inserted
+
+# Export
+EXPORT_BATCH_SIZE = 1000
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+async def export_rows(resource: ExportResource, season_id: Optional[str] = None):
+    """Iterate the documents of an export in batches straight off the Motor cursor"""
+    if resource == ExportResource.TEAMS:
+        cursor = db.teams.find({}, {"_id": 0}).sort([("created_at", ASCENDING), ("id", ASCENDING)])
+    elif resource == ExportResource.MATCHES:
+        cursor = db.matches.find({"season_id": season_id}, {"_id": 0}).sort([("match_date", ASCENDING), ("id", ASCENDING)])
+    else:
+        # One row per team: small enough to rank in memory with the tie-breakers
+        for doc in await read_standings(season_id):
+            yield doc
+        return
+    
+    async for doc in cursor.batch_size(EXPORT_BATCH_SIZE):
+        yield doc
+
+async def stream_export(
+    resource: ExportResource, export_format: ExportFormat, columns: List[str], season_id: Optional[str] = None
+):
+    """Serialize an export chunk by chunk, one chunk per cursor batch"""
+    buffer = io.StringIO()
+    writer = None
+    if export_format == ExportFormat.CSV:
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+    
+    rows = 0
+    async for doc in export_rows(resource, season_id):
+        if writer:
+            writer.writerow({key: value.isoformat() if isinstance(value, datetime) else value for key, value in doc.items()})
+        else:
+            buffer.write(json.dumps(doc, default=_json_default, ensure_ascii=False))
+            buffer.write("\n")
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+# Live feed
+def publish_match_update(before: Optional[dict], after: dict):
+    """Push a live match update, and the standings change it causes, to feed subscribers"""
+    live = MatchStatus.LIVE.value
+    if after.get("status") != live and (before or {}).get("status") != live:
+        return
+    
+    live_feed.publish("match", Match(**after).dict())
+    if before is not None:
+        deltas = standings_delta(before, after)
+        if deltas:
+            live_feed.publish("standings", {
+                "match_id": after["id"],
+                "deltas": [{"team_id": team_id, **team_delta} for team_id, team_delta in deltas.items()],
+            })
+
+# Live write-behind
+# Score updates to a LIVE match are merged in memory for a short window and
+# written together; reads of the match see the buffered state meanwhile.
+def version_filter(version: int):
+    # Matches written before versioning have no field: they count as version 0
+    return version if version else {"$in": [0, None]}
+
+async def flush_buffered_matches(changes: List[Tuple[dict, dict]]):
+    """Write the coalesced state of buffered matches, then the derived deltas of those written"""
+    fields = [field for field in MatchUpdate.model_fields if field != "version"]
+    # One guarded update per match, sent concurrently: each result tells
+    # whether that match was still at the version it was buffered from.
+    # A single bulk_write only reports a total, and re-reading versions
+    # cannot tell this write from another process's write of the same version.
+    results = await asyncio.gather(*(
+        db.matches.update_one(
+            {"id": before["id"], "version": version_filter(before.get("version", 0))},
+            {"$set": {
+                **{field: after.get(field) for field in fields if after.get(field) != before.get(field)},
+                "version": after["version"],
+            }},
+        )
+        for before, after in changes
+    ))
+    written = [change for change, result in zip(changes, results) if result.matched_count]
+    if len(written) < len(changes):
+        # Another process wrote these matches since they were buffered: their
+        # buffered state is dropped and the tables keep following the database
+        logger.warning("Write-behind: %d of %d buffered matches changed underneath, their updates were dropped",
+                       len(changes) - len(written), len(changes))
+    
+    for before, after in written:
+        await apply_standings_delta(before, after)
+        await record_snapshot_delta(before, after)
+        await inc_counters(counters_delta(before, after), before.get("season_id"))
+    bump_data_version()
+
+live_buffer = (
+    WriteBehindBuffer(LIVE_WRITE_BEHIND_MS / 1000, flush_buffered_matches) if LIVE_WRITE_BEHIND_MS > 0 else None
+)
+
+@contextlib.asynccontextmanager
+async def live_buffer_flushed(match_ids: Optional[List[str]] = None):
+    """Persist buffered changes (all, or those of `match_ids`) and buffer no others until the block ends"""
+    if not live_buffer:
+        yield
+        return
+    async with live_buffer.lock:
+        await live_buffer.flush_locked(match_ids)
+        yield
+
+def with_buffered_state(matches: List[dict]) -> List[dict]:
+    """Replace listed matches by their buffered state, keeping each document's fields"""
+    if not live_buffer:
+        return matches
+    for i, match in enumerate(matches):
+        buffered = live_buffer.pending(match.get("id"))
+        if buffered:
+            matches[i] = {field: buffered.get(field) for field in match}
+    return matches
+
+async def stage_live_update(match_id: str, match_update: MatchUpdate, update_data: dict) -> Optional[dict]:
+    """Buffer an update that keeps a match LIVE and return its new state.
+
+    Returns None when the update must be written directly, after flushing
+    the match's buffered changes so the direct write starts from them.
+    Called with the buffer lock held.
+    """
+    buffered = live_buffer.pending(match_id)
+    match = buffered or await db.matches.find_one({"id": match_id}, {"_id": 0})
+    if not match:
+        raise HTTPException(status_code=404, detail="Match non trouvé")
+    if match_update.version is not None and match_update.version != match.get("version", 0):
+        raise HTTPException(status_code=409, detail="Le match a été modifié entre-temps, veuillez recharger")
+    
+    updated_match = {**match, **update_data, "version": match.get("version", 0) + 1}
+    live = MatchStatus.LIVE.value
+    if match.get("status") == live and updated_match.get("status") == live:
+        live_buffer.stage(match_id, match, updated_match)
+        if LIVE_FEED_SOURCE == "local":
+            publish_match_update(match, updated_match)
+        return updated_match
+    
+    if buffered:
+        # Leaving LIVE (finished, cancelled...): persist the buffered score first
+        await live_buffer.flush_locked([match_id])
+    return None
+
+# Response cache
+# Rankings and dashboard only change on team and match writes, so their
+# serialized responses are kept per data version and revalidated by ETag.
+data_version = 0
+response_cache: Dict[str, Tuple[int, float, str, bytes]] = {}
+
+def bump_data_version():
+    """Invalidate cached responses after a team or match write"""
+    global data_version
+    data_version += 1
+    response_cache.clear()
+
+def cache_fresh(version: int, cached_at: float) -> bool:
+    """Whether a cache entry is still valid: no local write since, and younger than CACHE_MAX_AGE"""
+    return version == data_version and time.monotonic() - cached_at < CACHE_MAX_AGE
+
+async def cached_response(key: str, request: Request, build: Callable[[], Awaitable]) -> Response:
+    """Serve a cached JSON response for the current data version, honouring If-None-Match"""
+    entry = response_cache.get(key)
+    if entry is None or not cache_fresh(entry[0], entry[1]):
+        version, cached_at = data_version, time.monotonic()
+        # A lagging secondary could return data older than this version,
+        # which would then be served until the next write: read the primary
+        token = request_read_preference.set(None)
+        try:
+            body = json.dumps(jsonable_encoder(await build()), separators=(",", ":")).encode()
+        finally:
+            request_read_preference.reset(token)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        entry = (version, cached_at, etag, body)
+        if version == data_version:
+            response_cache[key] = entry
+    
+    _, _, etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Seasons
+# Seasons and competitions are few and rarely written: keep them in
+# memory for the current data version instead of querying per request.
+# Writes read them afresh, so a season created or made current through
+# another worker is never missed when filing matches.
+partitions_cache: Tuple[int, float, Dict[str, dict], Dict[str, dict]] = (-1, 0.0, {}, {})
+
+async def load_partitions(fresh: bool = False) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    global partitions_cache
+    if fresh or not cache_fresh(partitions_cache[0], partitions_cache[1]):
+        version, cached_at = data_version, time.monotonic()
+        seasons = {season["id"]: season for season in await db.seasons.find({}, {"_id": 0}).to_list(None)}
+        competitions = {competition["id"]: competition for competition in await db.competitions.find({}, {"_id": 0}).to_list(None)}
+        partitions_cache = (version, cached_at, seasons, competitions)
+    return partitions_cache[2], partitions_cache[3]
+
+# Selects the data filed outside any season (recorded before seasons were
+# created, or dated outside all of them), stored with a null season_id
+UNSEASONED = "none"
+
+async def resolve_season(season_id: Optional[str], fresh: bool = False) -> Optional[str]:
+    """The requested season, or the current one when none is given (None without seasons)"""
+    if season_id == UNSEASONED:
+        return None
+    seasons, _ = await load_partitions(fresh)
+    if season_id is not None:
+        if season_id not in seasons:
+            raise HTTPException(status_code=404, detail="Saison non trouvée")
+        return season_id
+    current = next((season for season in seasons.values() if season.get("is_current")), None)
+    return current["id"] if current else None
+
+def season_covers(season: dict, match_date: datetime) -> bool:
+    """Whether a date falls within a season, first and last days included"""
+    return season["start_date"].date() <= match_date.date() <= season["end_date"].date()
+
+def season_for_match(seasons: Dict[str, dict], season_id: Optional[str], match_date: datetime) -> Optional[str]:
+    """The season a new match is filed in.
+
+    A requested season must cover the match date. Otherwise the season
+    covering it is picked, the current one first; a date outside every
+    season files the match with the unseasoned data.
+    """
+    if season_id == UNSEASONED:
+        return None
+    if season_id is not None:
+        if season_id not in seasons:
+            raise HTTPException(status_code=404, detail="Saison non trouvée")
+        if not season_covers(seasons[season_id], match_date):
+            raise HTTPException(status_code=400, detail="La date du match est en dehors de la saison")
+        return season_id
+    
+    covering = [season for season in seasons.values() if season_covers(season, match_date)]
+    if not covering:
+        return None
+    return max(covering, key=lambda season: (bool(season.get("is_current")), season["start_date"]))["id"]
+
+async def check_competition(competition_id: Optional[str], fresh: bool = False):
+    _, competitions = await load_partitions(fresh)
+    if competition_id is not None and competition_id not in competitions:
+        raise HTTPException(status_code=404, detail="Compétition non trouvée")
+
 # API Routes
 
+# Seasons
+@api_router.post("/seasons", response_model=Season)
+async def create_season(season_data: SeasonCreate):
+    if season_data.end_date <= season_data.start_date:
+        raise HTTPException(status_code=400, detail="La fin de saison doit suivre son début")
+    
+    season = Season(**season_data.dict())
+    if season.is_current:
+        await db.seasons.update_many({"is_current": True}, {"$set": {"is_current": False}})
+    await db.seasons.insert_one(season.dict())
+    bump_data_version()
+    return season
+
+@api_router.get("/seasons", response_model=List[Season])
+async def get_seasons():
+    seasons = await db.seasons.find().sort("start_date", -1).to_list(None)
+    return [Season(**season) for season in seasons]
+
+@api_router.put("/seasons/{season_id}/current", response_model=Season)
+async def set_current_season(season_id: str):
+    season = await db.seasons.find_one({"id": season_id})
+    if not season:
+        raise HTTPException(status_code=404, detail="Saison non trouvée")
+    
+    await db.seasons.update_many({"is_current": True, "id": {"$ne": season_id}}, {"$set": {"is_current": False}})
+    await db.seasons.update_one({"id": season_id}, {"$set": {"is_current": True}})
+    season["is_current"] = True
+    bump_data_version()
+    return Season(**season)
+
+@api_router.post("/admin/seasons/{season_id}/assign-unseasoned")
+async def assign_unseasoned_matches(season_id: str):
+    """File the unseasoned matches dated within a season into it and rebuild both partitions"""
+    seasons, _ = await load_partitions(fresh=True)
+    season = seasons.get(season_id)
+    if not season:
+        raise HTTPException(status_code=404, detail="Saison non trouvée")
+    
+    start = matchday_date(season["start_date"])
+    end = matchday_date(season["end_date"]) + timedelta(days=1)
+    # Buffered live scores are written first, and none is buffered until the rebuilds are done
+    async with live_buffer_flushed():
+        result = await db.matches.update_many(
+            {"season_id": None, "match_date": {"$gte": start, "$lt": end}}, {"$set": {"season_id": season_id}}
+        )
+        reports = {}
+        for partition in (season_id, None):
+            reports[partition or UNSEASONED] = {
+                "teams": (await rebuild_standings(partition))["teams"],
+                "matchdays": await rebuild_snapshots(partition),
+                "counters": await rebuild_counters(partition),
+            }
+    bump_data_version()
+    return {"matches": result.modified_count, "partitions": reports}
+
+# Competitions
+@api_router.post("/competitions", response_model=Competition)
+async def create_competition(competition_data: CompetitionCreate):
+    competition = Competition(**competition_data.dict())
+    await db.competitions.insert_one(competition.dict())
+    bump_data_version()
+    return competition
+
+@api_router.get("/competitions", response_model=List[Competition])
+async def get_competitions():
+    competitions = await db.competitions.find().sort("name", 1).to_list(None)
+    return [Competition(**competition) for competition in competitions]
+
 # Teams
 @api_router.post("/teams", response_model=Team)
 async def create_team(team_data: TeamCreate):
     team = Team(**team_data.dict())
     await db.teams.insert_one(team.dict())
+    await db.standings.insert_one(standings_row(team.dict()))
+    await add_snapshot_rows(None, [team.dict()])
+    await inc_counters({"teams_count": 1})
+    bump_data_version()
     return team
 
+@api_router.post("/teams/bulk", response_model=BulkImportResult)
+async def bulk_create_teams(request: Request):
+    result = BulkImportResult()
+    async for result, batch in iter_bulk_batches(request, TeamCreate):
+        docs = [(index, Team(**team_data.dict()).dict()) for index, team_data in batch]
+        teams = await insert_batch(db.teams, docs, result)
+        if teams:
+            await db.standings.insert_many([standings_row(team) for team in teams], ordered=False)
+            await add_snapshot_rows(None, teams)
+            await inc_counters({"teams_count": len(teams)})
+    
+    if result.inserted:
+        bump_data_version()
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
 @api_router.get("/teams", response_model=List[Team])
-async def get_teams():
-    teams = await db.teams.find().to_list(1000)
-    return [Team(**team) for team in teams]
+async def get_teams(
+    response: Response,
+    limit: int = Query(PAGE_SIZE, ge=1, le=PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    if fields:
+        projection = fields_projection(fields, Team, "created_at")
+        teams = await fetch_page(db.teams, {}, "created_at", ASCENDING, limit, after, response, projection)
+        return projected_response(teams, response)
+    
+    teams = await fetch_page(db.teams, {}, "created_at", ASCENDING, limit, after, response)
+    return model_list_response(Team, teams, response)
 
 @api_router.get("/teams/{team_id}", response_model=Team)
 async def get_team(team_id: str):
@@ -201,20 +1633,27 @@ async def get_team(team_id: str):
 
 @api_router.delete("/teams/{team_id}")
 async def delete_team(team_id: str):
-    # Check if team exists
-    team = await db.teams.find_one({"id": team_id})
-    if not team:
-        raise HTTPException(status_code=404, detail="Équipe non trouvée")
-    
     # Check if team has matches
     matches_count = await db.matches.count_documents({
         "$or": [{"home_team_id": team_id}, {"away_team_id": team_id}]
-    })
+    }, limit=1)
     
     if matches_count > 0:
         raise HTTPException(status_code=400, detail="Impossible de supprimer une équipe qui a des matchs associés")
     
-    await db.teams.delete_one({"id": team_id})
+    # The delete doubles as the existence check
+    result = await db.teams.delete_one({"id": team_id})
+    if not result.deleted_count:
+        raise HTTPException(status_code=404, detail="Équipe non trouvée")
+    
+    # Empty rows may remain in the tables of seasons whose fixtures were deleted
+    season_ids = await db.standings.distinct("season_id", {"team_id": team_id})
+    await db.standings.delete_many({"team_id": team_id})
+    await db.standings_history.delete_many({"team_id": team_id})
+    await db.head_to_head.delete_many({"$or": [{"team_id": team_id}, {"opponent_id": team_id}]})
+    for season_id in season_ids:
+        await inc_counters({"teams_count": -1}, season_id)
+    bump_data_version()
     return {"message": "Équipe supprimée avec succès"}
 
 # Matches
@@ -230,62 +1669,444 @@ async def create_match(match_data: MatchCreate):
     if match_data.home_team_id == match_data.away_team_id:
         raise HTTPException(status_code=400, detail="Une équipe ne peut pas jouer contre elle-même")
     
-    match = Match(**match_data.dict())
+    seasons, _ = await load_partitions(fresh=True)
+    season_id = season_for_match(seasons, match_data.season_id, match_data.match_date)
+    await check_competition(match_data.competition_id)
+    
+    match = Match(**{**match_data.dict(), "season_id": season_id})
     await db.matches.insert_one(match.dict())
+    teams_added = await ensure_standings_rows(season_id, [home_team, away_team])
+    await inc_counters({**counters_delta(None, match.dict()), "teams_count": teams_added}, season_id)
+    bump_data_version()
     return match
 
+@api_router.post("/matches/bulk", response_model=BulkImportResult)
+async def bulk_create_matches(request: Request):
+    result = BulkImportResult()
+    async for result, batch in iter_bulk_batches(request, MatchCreate):
+        # Verify every referenced team with a single query per batch
+        team_ids = {team_id for _, match_data in batch for team_id in (match_data.home_team_id, match_data.away_team_id)}
+        known = {
+            team["id"]: team
+            for team in await db.teams.find(
+                {"id": {"$in": list(team_ids)}}, {"_id": 0, "id": 1, "name": 1, "created_at": 1}
+            ).to_list(None)
+        }
+        seasons, competitions = await load_partitions(fresh=True)
+        
+        docs = []
+        for index, match_data in batch:
+            if match_data.home_team_id not in known or match_data.away_team_id not in known:
+                result.errors.append(BulkImportError(index=index, detail="Une ou plusieurs équipes non trouvées"))
+            elif match_data.home_team_id == match_data.away_team_id:
+                result.errors.append(BulkImportError(index=index, detail="Une équipe ne peut pas jouer contre elle-même"))
+            elif match_data.competition_id is not None and match_data.competition_id not in competitions:
+                result.errors.append(BulkImportError(index=index, detail="Compétition non trouvée"))
+            else:
+                try:
+                    season_id = season_for_match(seasons, match_data.season_id, match_data.match_date)
+                except HTTPException as e:
+                    result.errors.append(BulkImportError(index=index, detail=e.detail))
+                    continue
+                docs.append((index, Match(**{**match_data.dict(), "season_id": season_id}).dict()))
+        
+        # Counters and table rows per season touched by the batch
+        deltas: Dict[Optional[str], Dict[str, int]] = {}
+        participants: Dict[Optional[str], Dict[str, dict]] = {}
+        for match in await insert_batch(db.matches, docs, result):
+            delta = deltas.setdefault(match["season_id"], {})
+            for field, value in match_counters(match).items():
+                delta[field] = delta.get(field, 0) + value
+            for team_id in (match["home_team_id"], match["away_team_id"]):
+                participants.setdefault(match["season_id"], {})[team_id] = known[team_id]
+        for season_id, delta in deltas.items():
+            delta["teams_count"] = await ensure_standings_rows(season_id, list(participants[season_id].values()))
+            await inc_counters(delta, season_id)
+    
+    if result.inserted:
+        bump_data_version()
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
+@api_router.post("/matches/schedule", response_model=List[Match])
+async def schedule_round_robin(schedule: ScheduleRequest):
+    if len(schedule.team_ids) < 2:
+        raise HTTPException(status_code=400, detail="Au moins deux équipes sont nécessaires")
+    if len(set(schedule.team_ids)) != len(schedule.team_ids):
+        raise HTTPException(status_code=400, detail="Une équipe ne peut figurer qu'une fois dans le calendrier")
+    if schedule.venue_policy == VenuePolicy.FIXED and not schedule.venue:
+        raise HTTPException(status_code=400, detail="Un lieu est requis pour un calendrier à lieu fixe")
+    
+    rounds = round_robin_rounds(schedule.team_ids, schedule.double_round)
+    last_date = schedule.start_date + timedelta(days=(len(rounds) - 1) * schedule.interval_days)
+    seasons, _ = await load_partitions(fresh=True)
+    season_id = season_for_match(seasons, schedule.season_id, schedule.start_date)
+    if season_for_match(seasons, schedule.season_id, last_date) != season_id:
+        raise HTTPException(status_code=400, detail="Le calendrier doit tenir dans une seule saison")
+    await check_competition(schedule.competition_id)
+    
+    teams = {
+        team["id"]: team
+        for team in await db.teams.find(
+            {"id": {"$in": schedule.team_ids}}, {"_id": 0, "id": 1, "name": 1, "city": 1, "created_at": 1}
+        ).to_list(None)
+    }
+    if len(teams) != len(schedule.team_ids):
+        raise HTTPException(status_code=404, detail="Une ou plusieurs équipes non trouvées")
+    
+    matches = []
+    for matchday, pairs in enumerate(rounds):
+        match_date = schedule.start_date + timedelta(days=matchday * schedule.interval_days)
+        for home_team_id, away_team_id in pairs:
+            venue = schedule.venue if schedule.venue_policy == VenuePolicy.FIXED else teams[home_team_id]["city"]
+            matches.append(Match(
+                season_id=season_id,
+                competition_id=schedule.competition_id,
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                match_date=match_date,
+                venue=venue,
+            ))
+    
+    docs = [match.dict() for match in matches]
+    await db.matches.insert_many(docs)
+    teams_added = await ensure_standings_rows(season_id, list(teams.values()))
+    await inc_counters({
+        "teams_count": teams_added,
+        "matches_count": len(docs),
+        STATUS_COUNTERS[MatchStatus.SCHEDULED.value]: len(docs),
+    }, season_id)
+    bump_data_version()
+    return matches
+
+def match_filters(
+    season_id: Optional[str],
+    competition_id: Optional[str] = None,
+    team_id: Optional[str] = None,
+    status: Optional[MatchStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    venue: Optional[str] = None,
+) -> dict:
+    """Mongo filter for the match listing, shaped to stay on the season-leading indexes"""
+    query = {"season_id": season_id}
+    if competition_id is not None:
+        query["competition_id"] = competition_id
+    if status is not None:
+        query["status"] = status.value
+    if venue is not None:
+        query["venue"] = venue
+    if date_from is not None or date_to is not None:
+        query["match_date"] = {}
+        if date_from is not None:
+            query["match_date"]["$gte"] = date_from
+        if date_to is not None and date_to == matchday_date(date_to):
+            # A date without a time (parsed as midnight) includes that whole day
+            query["match_date"]["$lt"] = date_to + timedelta(days=1)
+        elif date_to is not None:
+            query["match_date"]["$lte"] = date_to
+    if team_id is not None:
+        # Each side has its (season_id, team, match_date) index; season_id also
+        # stays top-level so the plan keeps an index prefix under a keyset $and
+        query["$or"] = [{"home_team_id": team_id}, {"away_team_id": team_id}]
+    return query
+
 @api_router.get("/matches", response_model=List[Match])
-async def get_matches():
-    matches = await db.matches.find().sort("match_date", 1).to_list(1000)
-    return [Match(**match) for match in matches]
+async def get_matches(
+    response: Response,
+    limit: int = Query(PAGE_SIZE, ge=1, le=PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: ListView = ListView.FULL,
+    season_id: Optional[str] = None,
+    competition_id: Optional[str] = None,
+    team_id: Optional[str] = None,
+    status: Optional[MatchStatus] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    venue: Optional[str] = None,
+):
+    query = match_filters(
+        await resolve_season(season_id), competition_id, team_id, status, date_from, date_to, venue
+    )
+    
+    if fields:
+        projection = fields_projection(fields, Match, "match_date")
+        matches = await fetch_page(db.matches, query, "match_date", ASCENDING, limit, after, response, projection)
+        return projected_response(with_buffered_state(matches), response)
+    if view == ListView.SUMMARY:
+        matches = await fetch_page(db.matches, query, "match_date", ASCENDING, limit, after, response, MATCH_SUMMARY_PROJECTION)
+        return model_list_response(MatchSummary, with_buffered_state(matches), response)
+    
+    matches = await fetch_page(db.matches, query, "match_date", ASCENDING, limit, after, response)
+    return model_list_response(Match, with_buffered_state(matches), response)
 
 @api_router.get("/matches/{match_id}", response_model=Match)
 async def get_match(match_id: str):
-    match = await db.matches.find_one({"id": match_id})
+    buffered = live_buffer.pending(match_id) if live_buffer else None
+    match = buffered or await db.matches.find_one({"id": match_id})
     if not match:
         raise HTTPException(status_code=404, detail="Match non trouvé")
     return Match(**match)
 
-@api_router.put("/matches/{match_id}", response_model=Match)
-async def update_match(match_id: str, match_update: MatchUpdate):
-    match = await db.matches.find_one({"id": match_id})
-    if not match:
-        raise HTTPException(status_code=404, detail="Match non trouvé")
-    
-    update_data = {k: v for k, v in match_update.dict().items() if v is not None}
+async def write_match_update(match_id: str, match_update: MatchUpdate, update_data: dict) -> Match:
+    """Write an update to the database, then move the standings, history and counters"""
+    query = {"id": match_id}
+    if match_update.version is not None:
+        query["version"] = version_filter(match_update.version)
     
+    update = {"$inc": {"version": 1}}
     if update_data:
-        await db.matches.update_one({"id": match_id}, {"$set": update_data})
+        update["$set"] = update_data
+    
+    # One atomic round trip. The standings deltas need the old state, so the
+    # pre-image is returned and the new state derived from the applied $set.
+    match = await db.matches.find_one_and_update(
+        query, update, projection={"_id": 0}, return_document=ReturnDocument.BEFORE
+    )
+    if not match:
+        if match_update.version is not None and await db.matches.count_documents({"id": match_id}, limit=1):
+            raise HTTPException(status_code=409, detail="Le match a été modifié entre-temps, veuillez recharger")
+        raise HTTPException(status_code=404, detail="Match non trouvé")
     
-    updated_match = await db.matches.find_one({"id": match_id})
+    updated_match = {**match, **update_data, "version": match.get("version", 0) + 1}
+    await apply_standings_delta(match, updated_match)
+    await record_snapshot_delta(match, updated_match)
+    await inc_counters(counters_delta(match, updated_match), match.get("season_id"))
+    bump_data_version()
+    if LIVE_FEED_SOURCE == "local":
+        publish_match_update(match, updated_match)
     return Match(**updated_match)
 
+@api_router.put("/matches/{match_id}", response_model=Match)
+async def update_match(match_id: str, match_update: MatchUpdate):
+    update_data = {k: v for k, v in match_update.dict(exclude={"version"}).items() if v is not None}
+    if live_buffer:
+        async with live_buffer.lock:
+            staged = await stage_live_update(match_id, match_update, update_data)
+            if staged is not None:
+                return Match(**staged)
+            # Written under the lock: no update can be buffered over the state being replaced
+            return await write_match_update(match_id, match_update, update_data)
+    return await write_match_update(match_id, match_update, update_data)
+
 @api_router.delete("/matches/{match_id}")
 async def delete_match(match_id: str):
-    match = await db.matches.find_one({"id": match_id})
+    # Deleted under the buffer lock, so no update is buffered for it in between
+    async with live_buffer_flushed([match_id]):
+        match = await db.matches.find_one_and_delete({"id": match_id}, projection={"_id": 0})
     if not match:
         raise HTTPException(status_code=404, detail="Match non trouvé")
     
-    await db.matches.delete_one({"id": match_id})
+    await apply_standings_delta(match, None)
+    await record_snapshot_delta(match, None)
+    await inc_counters(counters_delta(match, None), match.get("season_id"))
+    bump_data_version()
     return {"message": "Match supprimé avec succès"}
 
+# Live feed
+@api_router.get("/live/stream")
+async def live_stream(request: Request):
+    return StreamingResponse(
+        live_feed.stream(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Rankings
 @api_router.get("/rankings", response_model=List[Ranking])
-async def get_rankings():
-    rankings = await calculate_rankings()
-    return [Ranking(**ranking) for ranking in rankings]
+async def get_rankings(
+    request: Request,
+    season_id: Optional[str] = None,
+    as_of: Optional[datetime] = None,
+    matchday: Optional[int] = Query(None, ge=1),
+):
+    season_id = await resolve_season(season_id)
+    if as_of is not None or matchday is not None:
+        # Keyed by the matchday date found, not the requested one: arbitrary
+        # as_of values all map onto the season's few recorded matchdays
+        day = await snapshot_date(season_id, as_of, matchday)
+        
+        async def build():
+            rankings = await read_snapshot(season_id, day)
+            return [Ranking(**ranking) for ranking in rankings]
+        
+        return await cached_response(f"rankings:{season_id}:{day.isoformat() if day else None}", request, build)
+    
+    async def build():
+        rankings = await read_standings(season_id)
+        return [Ranking(**ranking) for ranking in rankings]
+    
+    return await cached_response(f"rankings:{season_id}", request, build)
+
+@api_router.get("/teams/{team_id}/positions", response_model=List[TeamPosition])
+async def get_team_positions(team_id: str, season_id: Optional[str] = None):
+    season_id = await resolve_season(season_id)
+    if not await db.standings.find_one({"season_id": season_id, "team_id": team_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Équipe non trouvée")
+    return [TeamPosition(**entry) for entry in await position_history(team_id, season_id)]
+
+# Team summary
+def team_fixtures_pipeline(team_id: str, season_id: Optional[str], limit: int) -> list:
+    """A team's latest results and next fixtures, seen from its side, with opponent names joined"""
+    def side(home_field: str, away_field: str):
+        return {"$cond": ["$is_home", f"${home_field}", f"${away_field}"]}
+    
+    fixture = [
+        {"$lookup": {"from": "teams", "localField": "opponent_id", "foreignField": "id", "as": "opponent"}},
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "match_date": 1,
+            "venue": 1,
+            "status": 1,
+            "is_home": 1,
+            "opponent_id": 1,
+            "opponent_name": {"$arrayElemAt": ["$opponent.name", 0]},
+            "team_score": side("home_team_score", "away_team_score"),
+            "opponent_score": side("away_team_score", "home_team_score"),
+        }},
+    ]
+    return [
+        # One branch per side, each served by a season-leading team index
+        {"$match": {"$or": [
+            {"season_id": season_id, "home_team_id": team_id},
+            {"season_id": season_id, "away_team_id": team_id},
+        ]}},
+        {"$addFields": {"is_home": {"$eq": ["$home_team_id", team_id]}}},
+        {"$addFields": {"opponent_id": side("away_team_id", "home_team_id")}},
+        {"$facet": {
+            "recent": [
+                {"$match": {"status": MatchStatus.FINISHED.value}},
+                {"$sort": {"match_date": -1, "id": -1}},
+                {"$limit": limit},
+            ] + fixture,
+            "upcoming": [
+                {"$match": {"status": {"$in": [MatchStatus.SCHEDULED.value, MatchStatus.LIVE.value]}}},
+                {"$sort": {"match_date": 1, "id": 1}},
+                {"$limit": limit},
+            ] + fixture,
+        }},
+    ]
+
+def fixture_result(fixture: dict) -> Optional[str]:
+    team_score, opponent_score = fixture.get("team_score"), fixture.get("opponent_score")
+    if team_score is None or opponent_score is None:
+        return None
+    return "W" if team_score > opponent_score else "D" if team_score == opponent_score else "L"
+
+async def compute_team_summary(team_id: str, season_id: Optional[str], limit: int) -> TeamSummary:
+    # Record and position come from the maintained standings table
+    team, fixtures, rankings = await asyncio.gather(
+        db.teams.find_one({"id": team_id}, {"_id": 0}),
+        db.matches.aggregate(team_fixtures_pipeline(team_id, season_id, limit)).to_list(1),
+        read_standings(season_id),
+    )
+    if not team:
+        raise HTTPException(status_code=404, detail="Équipe non trouvée")
+    
+    fixtures = fixtures[0] if fixtures else {"recent": [], "upcoming": []}
+    for fixture in fixtures["recent"]:
+        fixture["result"] = fixture_result(fixture)
+    standing = next((ranking for ranking in rankings if ranking["team_id"] == team_id), None)
+    
+    return TeamSummary(
+        team=Team(**team),
+        season_id=season_id,
+        standing=Ranking(**standing) if standing else None,
+        recent=[TeamFixture(**fixture) for fixture in fixtures["recent"]],
+        upcoming=[TeamFixture(**fixture) for fixture in fixtures["upcoming"]],
+    )
+
+@api_router.get("/teams/{team_id}/summary", response_model=TeamSummary)
+async def get_team_summary(
+    team_id: str,
+    request: Request,
+    season_id: Optional[str] = None,
+    fixtures: int = Query(5, ge=1, le=20),
+):
+    season_id = await resolve_season(season_id)
+    return await cached_response(
+        f"team-summary:{team_id}:{season_id}:{fixtures}", request,
+        lambda: compute_team_summary(team_id, season_id, fixtures),
+    )
+
+@api_router.post("/admin/standings/rebuild")
+async def rebuild_standings_table(season_id: Optional[str] = None):
+    season_id = await resolve_season(season_id, fresh=True)
+    report = await rebuild_standings(season_id)
+    report["matchdays"] = await rebuild_snapshots(season_id)
+    bump_data_version()
+    return report
 
 # News
 @api_router.post("/news", response_model=News)
 async def create_news(news_data: NewsCreate):
+    if news_data.season_id is not None:
+        await resolve_season(news_data.season_id, fresh=True)
     news = News(**news_data.dict())
     await db.news.insert_one(news.dict())
     return news
 
+async def news_season_filter(season_id: Optional[str]) -> dict:
+    """News are listed across seasons unless one is asked for ("none": unseasoned articles)"""
+    if season_id is None:
+        return {}
+    return {"season_id": await resolve_season(season_id)}
+
 @api_router.get("/news", response_model=List[News])
-async def get_news():
-    news_list = await db.news.find({"published": True}).sort("created_at", -1).to_list(1000)
-    return [News(**news) for news in news_list]
+async def get_news(
+    response: Response,
+    limit: int = Query(PAGE_SIZE, ge=1, le=PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: ListView = ListView.FULL,
+    season_id: Optional[str] = None,
+):
+    query = {"published": True, **await news_season_filter(season_id)}
+    if fields:
+        projection = fields_projection(fields, News, "created_at")
+        news_list = await fetch_page(db.news, query, "created_at", DESCENDING, limit, after, response, projection)
+        return projected_response(news_list, response)
+    if view == ListView.SUMMARY:
+        news_list = await fetch_page(db.news, query, "created_at", DESCENDING, limit, after, response, NEWS_SUMMARY_PROJECTION)
+        return model_list_response(NewsSummary, news_list, response)
+    
+    news_list = await fetch_page(db.news, query, "created_at", DESCENDING, limit, after, response)
+    return model_list_response(News, news_list, response)
+
+def news_search_pipeline(q: str, season_filter: dict, limit: int, after: Optional[str]) -> list:
+    """Published articles matching a text query, by descending relevance then id"""
+    query = {"$text": {"$search": q}, "published": True, **season_filter}
+    
+    pipeline = [
+        {"$match": query},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if after:
+        score, doc_id = decode_cursor(after, float)
+        pipeline.append({"$match": {"$or": [{"score": {"$lt": score}}, {"score": score, "id": {"$lt": doc_id}}]}})
+    pipeline += [
+        {"$sort": {"score": -1, "id": -1}},
+        {"$limit": limit + 1},
+        {"$project": {**NEWS_SUMMARY_PROJECTION, "score": 1}},
+    ]
+    return pipeline
+
+# Declared before /news/{news_id} so "search" is not taken for an id
+@api_router.get("/news/search", response_model=List[NewsSearchHit])
+async def search_news(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = None,
+    season_id: Optional[str] = None,
+):
+    hits = await db.news.aggregate(news_search_pipeline(q, await news_season_filter(season_id), limit, after)).to_list(limit + 1)
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(hits[-1], "score")
+    return model_list_response(NewsSearchHit, hits, response)
 
 @api_router.get("/news/{news_id}", response_model=News)
 async def get_news_item(news_id: str):
@@ -296,28 +2117,171 @@ async def get_news_item(news_id: str):
 
 @api_router.delete("/news/{news_id}")
 async def delete_news(news_id: str):
-    news = await db.news.find_one({"id": news_id})
-    if not news:
+    result = await db.news.delete_one({"id": news_id})
+    if not result.deleted_count:
         raise HTTPException(status_code=404, detail="Article non trouvé")
-    
-    await db.news.delete_one({"id": news_id})
     return {"message": "Article supprimé avec succès"}
 
-# Dashboard/Statistics
-@api_router.get("/dashboard")
-async def get_dashboard_stats():
-    teams_count = await db.teams.count_documents({})
-    matches_count = await db.matches.count_documents({})
-    finished_matches = await db.matches.count_documents({"status": "finished"})
-    upcoming_matches = await db.matches.count_documents({"status": "scheduled"})
-    
+# Export
+@api_router.get("/export/{resource}")
+async def export_data(
+    resource: ExportResource, format: ExportFormat = ExportFormat.NDJSON, season_id: Optional[str] = None
+):
+    season_id = await resolve_season(season_id)
+    model = {ExportResource.TEAMS: Team, ExportResource.MATCHES: Match, ExportResource.STANDINGS: Ranking}[resource]
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(resource, format, list(model.model_fields), season_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{resource.value}.{format.value}"'},
+    )
+
+@api_router.post("/admin/counters/rebuild")
+async def rebuild_dashboard_counters(season_id: Optional[str] = None):
+    counters = await rebuild_counters(await resolve_season(season_id, fresh=True))
+    bump_data_version()
+    return counters
+
+# Diagnostics
+@api_router.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics.render() + pool_stats.render(), media_type=metrics.CONTENT_TYPE)
+
+@api_router.get("/health")
+async def get_health():
+    """Readiness: MongoDB answers a ping within the server selection timeout, plus live pool figures"""
+    started = time.perf_counter()
+    try:
+        await db.command("ping")
+        mongo = {"ok": True, "ping_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except PyMongoError as e:
+        mongo = {"ok": False, "error": str(e)}
+    body = {
+        "status": "ok" if mongo["ok"] else "unavailable",
+        "mongo": mongo,
+        "pool": {
+            "max_size": MONGO_MAX_POOL_SIZE,
+            "min_size": MONGO_MIN_POOL_SIZE,
+            "wait_queue_timeout_ms": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "server_selection_timeout_ms": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "read_preference": MONGO_READ_PREFERENCE.mongos_mode,
+            "route_read_preferences": {route: preference.mongos_mode for route, preference in MONGO_ROUTE_READ_PREFERENCES.items()},
+            "servers": pool_stats.snapshot(),
+        },
+    }
+    return Response(content=orjson.dumps(body), media_type="application/json", status_code=200 if mongo["ok"] else 503)
+
+@api_router.get("/diagnostics/indexes")
+async def get_index_diagnostics():
+    status = await index_status()
     return {
-        "teams_count": teams_count,
-        "matches_count": matches_count,
-        "finished_matches": finished_matches,
-        "upcoming_matches": upcoming_matches
+        "ok": all(index["present"] for indexes in status.values() for index in indexes),
+        "collections": status,
     }
 
+# Dashboard/Statistics
+def match_cards_pipeline(query: dict, direction: int, limit: int) -> list:
+    """The first matches of a query by date, with both team names joined"""
+    return [
+        {"$match": query},
+        {"$sort": {"match_date": direction, "id": direction}},
+        {"$limit": limit},
+        {"$lookup": {"from": "teams", "localField": "home_team_id", "foreignField": "id", "as": "home_team"}},
+        {"$lookup": {"from": "teams", "localField": "away_team_id", "foreignField": "id", "as": "away_team"}},
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "home_team_id": 1,
+            "away_team_id": 1,
+            "home_team_name": {"$arrayElemAt": ["$home_team.name", 0]},
+            "away_team_name": {"$arrayElemAt": ["$away_team.name", 0]},
+            "home_team_score": 1,
+            "away_team_score": 1,
+            "match_date": 1,
+            "venue": 1,
+            "status": 1,
+        }},
+    ]
+
+def next_fixture_pipeline(season_id: Optional[str], now: datetime, limit: int = 1) -> list:
+    """Next scheduled matches of a season with both team names joined"""
+    query = {"season_id": season_id, "status": MatchStatus.SCHEDULED.value, "match_date": {"$gte": now}}
+    return match_cards_pipeline(query, ASCENDING, limit)
+
+def latest_results_pipeline(season_id: Optional[str], limit: int) -> list:
+    """Latest finished matches of a season with both team names joined"""
+    query = {"season_id": season_id, "status": MatchStatus.FINISHED.value}
+    return match_cards_pipeline(query, DESCENDING, limit)
+
+async def compute_dashboard_stats(season_id: Optional[str] = None):
+    # Both reads go out concurrently: one round trip of latency
+    counters, next_fixture = await asyncio.gather(
+        db.counters.find_one({"_id": counters_id(season_id)}, {"_id": 0}),
+        db.matches.aggregate(next_fixture_pipeline(season_id, datetime.utcnow())).to_list(1),
+    )
+    counters = counters or {}
+    
+    stats = {field: counters.get(field, 0) for field in DASHBOARD_COUNTERS}
+    stats["next_fixture"] = next_fixture[0] if next_fixture else None
+    return stats
+
+@api_router.get("/dashboard")
+async def get_dashboard_stats(request: Request, season_id: Optional[str] = None):
+    season_id = await resolve_season(season_id)
+    return await cached_response(f"dashboard:{season_id}", request, lambda: compute_dashboard_stats(season_id))
+
+# Home page
+@api_router.get("/home", response_model=HomePage)
+async def get_home(season_id: Optional[str] = None, limit: int = Query(3, ge=1, le=20)):
+    season_id = await resolve_season(season_id)
+    now = datetime.utcnow()
+    # Every section is read concurrently: the page costs one round trip of latency
+    stats, next_matches, recent_matches, news = await asyncio.gather(
+        compute_dashboard_stats(season_id),
+        db.matches.aggregate(next_fixture_pipeline(season_id, now, limit)).to_list(limit),
+        db.matches.aggregate(latest_results_pipeline(season_id, limit)).to_list(limit),
+        db.news.find({"published": True}, NEWS_SUMMARY_PROJECTION)
+        .sort([("created_at", DESCENDING), ("id", DESCENDING)])
+        .limit(limit)
+        .to_list(limit),
+    )
+    return HomePage(
+        stats=stats,
+        next_matches=[MatchCard(**match) for match in next_matches],
+        recent_matches=[MatchCard(**match) for match in recent_matches],
+        news=[NewsSummary(**item) for item in news],
+    )
+
+# Season analytics
+# Finished matches of a season are loaded into a pandas frame, kept like
+# cached responses; every figure is then computed on its columns.
+analytics_frames: Dict[Optional[str], Tuple[int, float, Any]] = {}
+
+async def load_analytics_frame(season_id: Optional[str]):
+    entry = analytics_frames.get(season_id)
+    if entry is None or not cache_fresh(entry[0], entry[1]):
+        version, cached_at = data_version, time.monotonic()
+        query = {"season_id": season_id, "status": MatchStatus.FINISHED.value}
+        entry = (version, cached_at, await analytics.load_match_frame(db.matches, query))
+        if version == data_version:
+            # Older versions can never be served again
+            for key in [key for key, (cached_version, _, _) in analytics_frames.items() if cached_version != version]:
+                del analytics_frames[key]
+            analytics_frames[season_id] = entry
+    return entry[2]
+
+async def compute_season_analytics(season_id: Optional[str]) -> SeasonAnalytics:
+    frame = await load_analytics_frame(season_id)
+    team_ids = list(set(frame["home_team_id"]) | set(frame["away_team_id"]))
+    teams = await db.teams.find({"id": {"$in": team_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+    figures = analytics.season_analytics(frame, {team["id"]: team["name"] for team in teams})
+    return SeasonAnalytics(season_id=season_id, **figures)
+
+@api_router.get("/analytics", response_model=SeasonAnalytics)
+async def get_season_analytics(request: Request, season_id: Optional[str] = None):
+    season_id = await resolve_season(season_id)
+    return await cached_response(f"analytics:{season_id}", request, lambda: compute_season_analytics(season_id))
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -327,7 +2291,9 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -336,6 +2302,84 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def init_indexes():
+    created = await ensure_indexes()
+    for collection_name, names in created.items():
+        logger.info("Created indexes on %s: %s", collection_name, ", ".join(names))
+    
+    status = await index_status()
+    missing = [
+        f"{collection_name}.{index['name']}"
+        for collection_name, indexes in status.items()
+        for index in indexes
+        if not index["present"] and not index["mismatch"]
+    ]
+    mismatched = [
+        f"{collection_name}.{index['name']} ({', '.join(index['mismatch'])})"
+        for collection_name, indexes in status.items()
+        for index in indexes
+        if index["mismatch"]
+    ]
+    if missing:
+        logger.warning("Missing indexes: %s", ", ".join(missing))
+    if mismatched:
+        logger.warning("Indexes with other options than expected: %s", ", ".join(mismatched))
+    if not missing and not mismatched:
+        logger.info("All %d indexes verified", sum(len(indexes) for indexes in status.values()))
+
+@app.on_event("startup")
+async def init_standings():
+    # Materialize the standings table on first start against an existing database
+    if await db.standings.estimated_document_count() == 0 and await db.teams.estimated_document_count() > 0:
+        report = await rebuild_standings()
+        logger.info("Standings table built for %d teams", report["teams"])
+
+@app.on_event("startup")
+async def init_head_to_head():
+    finished = await db.matches.count_documents({"season_id": None, "status": MatchStatus.FINISHED.value}, limit=1)
+    if finished and await db.head_to_head.estimated_document_count() == 0:
+        await rebuild_form_and_head_to_head()
+        logger.info("Form and head-to-head index built")
+
+@app.on_event("startup")
+async def init_standings_history():
+    if await db.standings_history.estimated_document_count() == 0 and await db.matches.count_documents({"status": MatchStatus.FINISHED.value}, limit=1):
+        matchdays = await rebuild_snapshots()
+        logger.info("Standings history built for %d matchdays", matchdays)
+
+@app.on_event("startup")
+async def init_counters():
+    if await db.counters.find_one({"_id": DASHBOARD_COUNTERS_ID}) is None:
+        counters = await rebuild_counters()
+        logger.info("Dashboard counters built: %s", counters)
+
+@app.on_event("startup")
+async def start_live_feed():
+    if LIVE_FEED_SOURCE != "change_stream":
+        return
+    pre_images = True
+    try:
+        # Pre-images let the change stream compute standings deltas (MongoDB 6.0+)
+        await db.command("collMod", "matches", changeStreamPreAndPostImages={"enabled": True})
+    except OperationFailure as e:
+        pre_images = False
+        logger.warning("Change stream pre-images unavailable, live feed runs without standings deltas: %s", e)
+    app.state.live_feed_task = asyncio.create_task(
+        watch_match_changes(db.matches, publish_match_update, pre_images=pre_images)
+    )
+
+@app.on_event("shutdown")
+async def stop_live_feed():
+    task = getattr(app.state, "live_feed_task", None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def flush_live_buffer():
+    if live_buffer:
+        await live_buffer.close()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
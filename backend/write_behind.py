@@ -0,0 +1,75 @@
+"""Write-behind buffer coalescing rapid updates to the same live match"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Change = Tuple[dict, dict]
+
+
+class WriteBehindBuffer:
+    """Hold the latest state of recently updated documents and persist them in batches.
+
+    Each entry keeps the state last written to the database (the base) and
+    the latest buffered state. Updates arriving within `window` seconds of
+    the first one are merged into a single change per document, and every
+    pending change is handed to `flush_changes` together. Callers that read
+    then stage an update hold `lock`, so a flush never interleaves with it.
+    """
+
+    def __init__(self, window: float, flush_changes: Callable[[List[Change]], Awaitable[None]]):
+        self.window = window
+        self.lock = asyncio.Lock()
+        self._flush_changes = flush_changes
+        self._entries: Dict[str, Change] = {}
+        self._timer: Optional[asyncio.Task] = None
+
+    def pending(self, key: str) -> Optional[dict]:
+        """The buffered state of a document, if it has unwritten changes"""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def stage(self, key: str, before: dict, after: dict):
+        """Record a new state; the base stays the one last written"""
+        entry = self._entries.get(key)
+        self._entries[key] = (entry[0] if entry else before, after)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        # Changes staged from here on schedule their own flush
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Write-behind flush failed")
+
+    async def flush(self, keys: Optional[Iterable[str]] = None):
+        async with self.lock:
+            await self.flush_locked(keys)
+
+    async def flush_locked(self, keys: Optional[Iterable[str]] = None):
+        """Persist the pending changes (all, or only `keys`) while holding `lock`"""
+        keys = list(self._entries) if keys is None else [key for key in keys if key in self._entries]
+        changes = [self._entries.pop(key) for key in keys]
+        if not changes:
+            return
+        try:
+            await self._flush_changes(changes)
+        except Exception:
+            # Put the changes back and retry them after another window, even
+            # if no further update arrives to schedule a flush
+            for key, change in zip(keys, changes):
+                self._entries.setdefault(key, change)
+            self._schedule_flush()
+            raise
+
+    async def close(self):
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark suite for the BOSTON Football Competition API
+
+Generates synthetic leagues at several scales, loads them into MongoDB
+(or an in-memory stand-in), drives the API concurrently in-process and
+reports throughput and latency percentiles per endpoint as JSON, twice:
+warm (served from the in-process response cache where the endpoint has
+one) and cold (caches disabled, so every request reads MongoDB).
+mongomock scans every collection it queries, so only the figures from a
+real mongod are representative at the larger scales, and without
+--mongo-url the default scales stop at 200 teams.
+
+    python backend_benchmark.py --scales 20,200 --output results.json
+    python backend_benchmark.py --mongo-url mongodb://localhost:27017 --compare results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "backend"))
+import server  # noqa: E402
+
+DIVISION_SIZE = 20
+DEFAULT_SCALES = "20,200,2000"
+MONGOMOCK_DEFAULT_SCALES = "20,200"
+MODES = ("warm", "cold")
+PLAYED_SHARE = 2 / 3
+NEWS_PER_TEAM = 0.5
+
+ENDPOINTS = {
+    "rankings": "/api/rankings",
+    "matches": "/api/matches?limit=100",
+    "dashboard": "/api/dashboard",
+    "news": "/api/news?limit=20",
+}
+
+
+def generate_league(n_teams: int, seed: int = 42) -> Dict[str, list]:
+    """Teams split into divisions of 20, each playing a double round-robin season.
+
+    The first two thirds of the matchdays are finished with random scores,
+    the rest are still scheduled.
+    """
+    rng = random.Random(seed)
+    kickoff = datetime(2024, 8, 3, 15)
+    teams = [server.Team(name=f"Team {i}", city=f"City {i % 50}").dict() for i in range(n_teams)]
+
+    matches = []
+    for start in range(0, n_teams, DIVISION_SIZE):
+        division = [team["id"] for team in teams[start:start + DIVISION_SIZE]]
+        rounds = server.round_robin_rounds(division, double_round=True)
+        played = int(len(rounds) * PLAYED_SHARE)
+        for matchday, pairs in enumerate(rounds):
+            for home_team_id, away_team_id in pairs:
+                match = server.Match(
+                    home_team_id=home_team_id, away_team_id=away_team_id,
+                    match_date=kickoff + timedelta(days=7 * matchday), venue="Stadium",
+                ).dict()
+                if matchday < played:
+                    match["status"] = server.MatchStatus.FINISHED.value
+                    match["home_team_score"] = rng.randint(0, 4)
+                    match["away_team_score"] = rng.randint(0, 3)
+                else:
+                    match["status"] = server.MatchStatus.SCHEDULED.value
+                matches.append(match)
+
+    news = [
+        server.News(title=f"Article {i}", content="Lorem ipsum dolor sit amet. " * 40, author="Rédaction").dict()
+        for i in range(max(1, int(n_teams * NEWS_PER_TEAM)))
+    ]
+    return {"teams": teams, "matches": matches, "news": news}
+
+
+def open_store(mongo_url: Optional[str]):
+    """A throwaway database on a real mongod, or mongomock when no URL is given"""
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(mongo_url)[f"boston_bench_{uuid.uuid4().hex[:8]}"], "mongod"
+
+    import mongomock_motor
+    return mongomock_motor.AsyncMongoMockClient()["boston_bench"], "mongomock"
+
+
+async def load_league(db, league: Dict[str, list], store: str = "mongomock"):
+    """Insert the league, then build the derived collections with the server's own rebuilds"""
+    server.db = db
+    for collection_name, docs in league.items():
+        for i in range(0, len(docs), server.BULK_BATCH_SIZE):
+            await db[collection_name].insert_many(docs[i:i + server.BULK_BATCH_SIZE])
+    if store == "mongod":
+        # Built after the bulk load, as a restore would, but before the
+        # rebuilds, whose per-team joins rely on the match indexes
+        await server.ensure_indexes()
+    await server.rebuild_standings()
+    await server.rebuild_snapshots()
+    await server.rebuild_counters()
+    # mongomock checks unique indexes with a scan on every insert: built last
+    await server.ensure_indexes()
+    server.bump_data_version()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def drive(client: httpx.AsyncClient, path: str, requests: int, concurrency: int, cold: bool = False) -> dict:
+    """Issue `requests` GETs from `concurrency` workers and summarize the latencies.
+
+    Cold runs give the server's in-process caches a zero max age, so every
+    request goes through the MongoDB read path instead of a cache hit.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+    cache_max_age = server.CACHE_MAX_AGE
+    if cold:
+        server.CACHE_MAX_AGE = 0
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        server.CACHE_MAX_AGE = cache_max_age
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run_scale(n_teams: int, mongo_url: Optional[str], requests: int, concurrency: int) -> dict:
+    league = generate_league(n_teams)
+    db, store = open_store(mongo_url)
+    try:
+        return await measure_scale(db, store, league, requests, concurrency)
+    finally:
+        if store == "mongod":
+            await db.client.drop_database(db.name)
+            db.client.close()
+
+
+async def measure_scale(db, store: str, league: Dict[str, list], requests: int, concurrency: int) -> dict:
+    started = time.perf_counter()
+    await load_league(db, league, store)
+    load_seconds = time.perf_counter() - started
+
+    result = {
+        "teams": len(league["teams"]),
+        "matches": len(league["matches"]),
+        "news": len(league["news"]),
+        "store": store,
+        "load_seconds": round(load_seconds, 2),
+        "endpoints": {},
+    }
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, path in ENDPOINTS.items():
+            # One warm-up request, so cached endpoints are measured warm
+            await client.get(path)
+            result["endpoints"][name] = {
+                mode: await drive(client, path, requests, concurrency, cold=mode == "cold") for mode in MODES
+            }
+            for mode in MODES:
+                print(f"  {name:<10} {mode:<5} {result['endpoints'][name][mode]}")
+    return result
+
+
+async def run_benchmark(scales: List[int], mongo_url: Optional[str], requests: int, concurrency: int) -> dict:
+    results = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "requests_per_endpoint": requests,
+        "concurrency": concurrency,
+        "scales": [],
+    }
+    for n_teams in scales:
+        print(f"🏟️  {n_teams} teams")
+        results["scales"].append(await run_scale(n_teams, mongo_url, requests, concurrency))
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1):
+    """Print p95 and throughput changes against a previous run, flagging regressions"""
+    previous = {scale["teams"]: scale for scale in baseline.get("scales", [])}
+    for scale in results["scales"]:
+        before = previous.get(scale["teams"])
+        if not before:
+            continue
+        for name, modes in scale["endpoints"].items():
+            old_modes = before["endpoints"].get(name) or {}
+            if "p95_ms" in old_modes:
+                # Results from before the cold runs were added: warm figures only
+                old_modes = {"warm": old_modes}
+            for mode, stats in modes.items():
+                old = old_modes.get(mode)
+                if not old:
+                    continue
+                p95_change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0
+                rps_change = (stats["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] if old["throughput_rps"] else 0
+                flag = "❌" if p95_change > threshold or rps_change < -threshold else "✅"
+                print(f"{flag} {scale['teams']:>5} teams {name:<10} {mode:<5} p95 {p95_change:+.0%}  throughput {rps_change:+.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        help=f"comma-separated team counts (default: {DEFAULT_SCALES}, or {MONGOMOCK_DEFAULT_SCALES} without --mongo-url)",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and scale")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mongo-url", help="run against this mongod instead of an in-memory stand-in")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    scales_arg = args.scales or (DEFAULT_SCALES if args.mongo_url else MONGOMOCK_DEFAULT_SCALES)
+    scales = [int(scale) for scale in scales_arg.split(",") if scale.strip()]
+    results = asyncio.run(run_benchmark(scales, args.mongo_url, args.requests, args.concurrency))
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"📄 Results saved to {args.output}")
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
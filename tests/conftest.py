@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "backend"), str(ROOT)]
+import server  # noqa: E402
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A fresh in-memory database, installed as the app's for the test"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    database = mongomock_motor.AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(server, "db", database)
+    return database
@@ -0,0 +1,38 @@
+"""Synthetic leagues shared by the tests"""
+import random
+from datetime import datetime, timedelta
+
+import server
+
+KICKOFF = datetime(2024, 8, 3, 15)
+STATUSES = ["finished", "finished", "finished", "scheduled", "live", "cancelled"]
+
+
+def generate_league(n_teams=10, seed=7, mixed=False):
+    """A double round-robin, one matchday a week from KICKOFF, played in the home team's city.
+
+    Every match is finished and scored, unless `mixed`: statuses are then
+    drawn at random and some finished matches lack their away score.
+    """
+    rng = random.Random(seed)
+    teams = [server.Team(name=f"Team {i}", city=f"City {i}").dict() for i in range(n_teams)]
+    cities = {team["id"]: team["city"] for team in teams}
+    matches = []
+    for matchday, pairs in enumerate(server.round_robin_rounds(list(cities))):
+        for home_team_id, away_team_id in pairs:
+            status = rng.choice(STATUSES) if mixed else "finished"
+            match = server.Match(
+                home_team_id=home_team_id, away_team_id=away_team_id,
+                match_date=KICKOFF + timedelta(days=7 * matchday), venue=cities[home_team_id], status=status,
+            ).dict()
+            if status != "scheduled":
+                match["home_team_score"] = rng.randint(0, 4)
+                match["away_team_score"] = rng.choice([None, 0, 1, 2, 3]) if mixed and status == "finished" else rng.randint(0, 3)
+            matches.append(match)
+    return {"teams": teams, "matches": matches}
+
+
+async def load_league(db, league):
+    # Copies: insert_many adds an _id to the documents it is given
+    await db.teams.insert_many([dict(team) for team in league["teams"]])
+    await db.matches.insert_many([dict(match) for match in league["matches"]])
@@ -0,0 +1,81 @@
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import analytics  # noqa: E402
+import server  # noqa: E402
+
+from .league import generate_league  # noqa: E402
+
+
+def expected_teams(matches):
+    """The per-team figures computed match by match"""
+    results = defaultdict(list)
+    for match in sorted(matches, key=lambda match: (match["match_date"], match["id"])):
+        results[match["home_team_id"]].append((True, match["home_team_score"], match["away_team_score"]))
+        results[match["away_team_id"]].append((False, match["away_team_score"], match["home_team_score"]))
+    league_average = sum(scored for games in results.values() for _, scored, _ in games) / sum(map(len, results.values()))
+
+    teams = {}
+    for team_id, games in results.items():
+        runs = []
+        for _, scored, _ in games:
+            if runs and runs[-1][0] == (scored > 0):
+                runs[-1][1] += 1
+            else:
+                runs.append([scored > 0, 1])
+        teams[team_id] = {
+            "played": len(games),
+            "goals_for": sum(scored for _, scored, _ in games),
+            "goals_against": sum(conceded for _, _, conceded in games),
+            "clean_sheets": sum(conceded == 0 for _, _, conceded in games),
+            "home_clean_sheets": sum(conceded == 0 for is_home, _, conceded in games if is_home),
+            "away_clean_sheets": sum(conceded == 0 for is_home, _, conceded in games if not is_home),
+            "longest_scoring_streak": max([length for flag, length in runs if flag], default=0),
+            "current_scoring_streak": runs[-1][1] if runs[-1][0] else 0,
+            "longest_scoreless_streak": max([length for flag, length in runs if not flag], default=0),
+            "attack_strength": round(sum(scored for _, scored, _ in games) / len(games) / league_average, 4),
+            "defence_strength": round(sum(conceded for _, _, conceded in games) / len(games) / league_average, 4),
+        }
+    return teams
+
+
+def test_season_analytics_match_a_match_by_match_computation(db):
+    matches = generate_league()["matches"]
+    # Unfinished matches stay out of the frame, and so do finished ones without a score
+    others = generate_league(seed=8)["matches"]
+    scheduled = dict(others[0], id="scheduled", status="scheduled")
+    unscored = dict(others[1], id="unscored", away_team_score=None)
+
+    async def run():
+        await db.matches.insert_many([dict(match) for match in matches] + [scheduled, unscored])
+        return await analytics.load_match_frame(db.matches, {"status": "finished"})
+
+    frame = asyncio.run(run())
+    figures = analytics.season_analytics(frame)
+
+    assert figures["matches"] == len(matches)
+    assert {team["team_id"]: {k: v for k, v in team.items() if k not in ("team_id", "team_name")}
+            for team in figures["teams"]} == expected_teams(matches)
+
+    home_wins = sum(match["home_team_score"] > match["away_team_score"] for match in matches)
+    draws = sum(match["home_team_score"] == match["away_team_score"] for match in matches)
+    assert figures["home_advantage"]["home_win_share"] == round(home_wins / len(matches), 4)
+    assert figures["home_advantage"]["home_points_per_match"] == round((3 * home_wins + draws) / len(matches), 4)
+
+    totals = [match["home_team_score"] + match["away_team_score"] for match in matches]
+    buckets = {bucket["goals"]: bucket["matches"] for bucket in figures["goals_distribution"]["buckets"]}
+    assert buckets == {goals: totals.count(goals) for goals in set(totals)}
+
+    # The response model accepts the figures as computed
+    server.SeasonAnalytics(**figures)
+
+
+def test_season_analytics_of_an_empty_season():
+    figures = analytics.season_analytics(analytics.pd.DataFrame(columns=list(analytics.MATCH_FIELDS)))
+    assert figures["matches"] == 0
+    assert figures["teams"] == []
+    assert figures["goals_distribution"]["buckets"] == []
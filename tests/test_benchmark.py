@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+import backend_benchmark  # noqa: E402
+
+
+def test_benchmark_smallest_scale_runs_clean(monkeypatch):
+    # load_league points the app at the benchmark database: restore it afterwards
+    monkeypatch.setattr(backend_benchmark.server, "db", backend_benchmark.server.db)
+    result = asyncio.run(backend_benchmark.run_scale(20, None, requests=20, concurrency=4))
+
+    assert result["teams"] == 20
+    assert result["matches"] == 20 * 19
+    assert set(result["endpoints"]) == set(backend_benchmark.ENDPOINTS)
+    for modes in result["endpoints"].values():
+        assert set(modes) == set(backend_benchmark.MODES)
+        for stats in modes.values():
+            assert stats["requests"] == 20
+            assert stats["errors"] == 0
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+    # The cold runs restore the server's cache settings
+    assert backend_benchmark.server.CACHE_MAX_AGE > 0
@@ -0,0 +1,26 @@
+import asyncio
+
+import server
+
+
+def test_index_with_other_options_is_not_reported_present(db):
+    async def run():
+        # Created by hand before the app, without the unique option
+        await db.teams.create_index("id")
+        await server.ensure_indexes()
+        return await server.get_index_diagnostics()
+
+    diagnostics = asyncio.run(run())
+    teams = {index["name"]: index for index in diagnostics["collections"]["teams"]}
+    assert teams["id_unique"]["present"] is False
+    assert teams["id_unique"]["mismatch"] == ["unique"]
+    assert teams["created_at_id"]["present"] is True
+    assert diagnostics["ok"] is False
+
+
+def test_text_index_options_are_compared():
+    text_index = next(index for index in server.INDEXES["news"] if index.document["name"] == "title_content_text")
+    info = {"key": [("_fts", "text"), ("_ftsx", 1)], "weights": {"title": 1, "content": 1}, "default_language": "english"}
+    assert server._index_mismatch(text_index, info) == ["weights", "default_language"]
+    info.update(weights={"content": 1, "title": 3}, default_language="french")
+    assert server._index_mismatch(text_index, info) == []
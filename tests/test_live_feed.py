@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from live_feed import watch_match_changes
+from pymongo.errors import OperationFailure
+
+
+class ChangeStream:
+    resume_token = {"_data": "1"}
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for change in self.changes:
+            yield change
+        # Stop the watcher once the changes are delivered
+        raise asyncio.CancelledError
+
+
+class MongoDB5Matches:
+    """A collection on a server that predates change stream pre-images"""
+    name = "matches"
+
+    def __init__(self):
+        self.calls = []
+
+    def watch(self, pipeline, **options):
+        self.calls.append(options)
+        if "full_document_before_change" in options:
+            raise OperationFailure("BSON field '$changeStream.fullDocumentBeforeChange' is an unknown field.", 40415)
+        return ChangeStream([{"fullDocument": {"id": "match", "home_team_score": 1}}])
+
+
+def test_change_stream_falls_back_to_watching_without_pre_images():
+    collection = MongoDB5Matches()
+    changes = []
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(watch_match_changes(collection, lambda before, after: changes.append((before, after))))
+
+    assert [("full_document_before_change" in call) for call in collection.calls] == [True, False]
+    assert changes == [(None, {"id": "match", "home_team_score": 1})]
@@ -0,0 +1,105 @@
+import asyncio
+import itertools
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+from .league import KICKOFF, generate_league, load_league
+
+LEAGUE = generate_league(8, mixed=True)
+TEAM = LEAGUE["teams"][3]
+
+FILTERS = {
+    "team_id": TEAM["id"],
+    "status": server.MatchStatus.FINISHED,
+    "date_from": KICKOFF + timedelta(days=14),
+    "date_to": KICKOFF + timedelta(days=70),
+    "venue": TEAM["city"],
+}
+
+
+def expected(matches, team_id=None, status=None, date_from=None, date_to=None, venue=None):
+    return sorted(
+        match["id"] for match in matches
+        if (team_id is None or team_id in (match["home_team_id"], match["away_team_id"]))
+        and (status is None or match["status"] == status)
+        and (date_from is None or match["match_date"] >= date_from)
+        and (date_to is None or match["match_date"] <= date_to)
+        and (venue is None or match["venue"] == venue)
+    )
+
+
+def combinations():
+    for size in range(1, len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, size):
+            yield {name: FILTERS[name] for name in names}
+
+
+def test_match_filters_select_matching_matches(db):
+    matches = LEAGUE["matches"]
+
+    async def run():
+        await load_league(db, LEAGUE)
+        for filters in combinations():
+            found = await db.matches.find(server.match_filters(None, **filters), {"id": 1}).to_list(None)
+            assert sorted(match["id"] for match in found) == expected(matches, **filters), filters
+
+    asyncio.run(run())
+
+
+def test_date_only_upper_bound_includes_that_day(db):
+    matches = LEAGUE["matches"]
+    day = datetime(KICKOFF.year, KICKOFF.month, KICKOFF.day)
+
+    async def run():
+        await load_league(db, LEAGUE)
+        found = await db.matches.find(server.match_filters(None, date_from=day, date_to=day), {"id": 1}).to_list(None)
+        return sorted(match["id"] for match in found)
+
+    first_matchday = expected(matches, date_from=KICKOFF, date_to=KICKOFF)
+    assert first_matchday
+    assert asyncio.run(run()) == first_matchday
+
+
+def plan_stages(plan):
+    """Every stage name in an explain() plan tree"""
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
+
+
+def test_match_filters_use_an_index():
+    """Needs a real mongod: MONGO_TEST_URL=mongodb://localhost:27017 pytest tests/test_match_filters.py"""
+    mongo_url = os.environ.get("MONGO_TEST_URL")
+    if not mongo_url:
+        pytest.skip("MONGO_TEST_URL is not set")
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=2000)
+    db = client["test_match_filters"]
+
+    async def run():
+        await client.drop_database(db.name)
+        await load_league(db, generate_league(40, mixed=True))
+        for collection_name, indexes in server.INDEXES.items():
+            await db[collection_name].create_indexes(indexes)
+        try:
+            # First pages and later pages, where the keyset condition wraps the filter
+            cursors = (None, server.encode_cursor({"match_date": KICKOFF, "id": ""}, "match_date"))
+            for filters, after in itertools.product(combinations(), cursors):
+                query = server.keyset_query(server.match_filters(None, **filters), "match_date", server.ASCENDING, after)
+                cursor = db.matches.find(query).sort([("match_date", 1), ("id", 1)]).limit(server.PAGE_SIZE + 1)
+                plan = (await cursor.explain())["queryPlanner"]["winningPlan"]
+                stages = set(plan_stages(plan))
+                assert "COLLSCAN" not in stages, (filters, after, plan)
+                assert stages & {"IXSCAN", "EXPRESS_IXSCAN"}, (filters, after, plan)
+        finally:
+            await client.drop_database(db.name)
+
+    asyncio.run(run())
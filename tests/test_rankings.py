@@ -0,0 +1,59 @@
+import asyncio
+
+import server
+
+from .league import generate_league, load_league
+
+
+async def legacy_rankings(db):
+    """Reference implementation: the original per-team Python loop"""
+    teams = await db.teams.find().to_list(None)
+    rankings = []
+    for team in teams:
+        r = {
+            "team_id": team["id"], "team_name": team["name"],
+            "played": 0, "won": 0, "drawn": 0, "lost": 0,
+            "goals_for": 0, "goals_against": 0, "goal_difference": 0, "points": 0,
+        }
+        matches = await db.matches.find({
+            "$or": [{"home_team_id": team["id"]}, {"away_team_id": team["id"]}],
+            "status": "finished",
+        }).to_list(None)
+        for match in matches:
+            if match.get("home_team_score") is None or match.get("away_team_score") is None:
+                continue
+            r["played"] += 1
+            if match["home_team_id"] == team["id"]:
+                gf, ga = match["home_team_score"], match["away_team_score"]
+            else:
+                gf, ga = match["away_team_score"], match["home_team_score"]
+            r["goals_for"] += gf
+            r["goals_against"] += ga
+            if gf > ga:
+                r["won"] += 1
+                r["points"] += 3
+            elif gf == ga:
+                r["drawn"] += 1
+                r["points"] += 1
+            else:
+                r["lost"] += 1
+        r["goal_difference"] = r["goals_for"] - r["goals_against"]
+        rankings.append(r)
+    rankings.sort(key=lambda x: (-x["points"], -x["goal_difference"], -x["goals_for"]))
+    for i, r in enumerate(rankings):
+        r["position"] = i + 1
+    return rankings
+
+
+def test_rankings_aggregation_matches_legacy_loop(db):
+    league = generate_league(24, mixed=True)
+    # A team with no matches at all must still be ranked
+    league["teams"].append(server.Team(name="Newcomer", city="Boston").dict())
+
+    async def run():
+        await load_league(db, league)
+        return await server.calculate_rankings(), await legacy_rankings(db)
+
+    rankings, expected = asyncio.run(run())
+    assert rankings == expected
+    assert [server.Ranking(**r) for r in rankings] == [server.Ranking(**r) for r in expected]
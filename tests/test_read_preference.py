@@ -0,0 +1,27 @@
+import asyncio
+
+import server
+from pymongo.read_preferences import SecondaryPreferred
+from starlette.requests import Request
+
+
+def test_cached_responses_are_built_from_the_primary():
+    """A lagging secondary read would be cached as the current version"""
+    seen = []
+
+    async def build():
+        seen.append(server.request_read_preference.get())
+        return {"ok": True}
+
+    async def run():
+        server.response_cache.clear()
+        server.request_read_preference.set(SecondaryPreferred())
+        request = Request({"type": "http", "method": "GET", "path": "/api/rankings", "headers": []})
+        response = await server.cached_response("test:read-preference", request, build)
+        return response, server.request_read_preference.get()
+
+    response, after = asyncio.run(run())
+    assert response.status_code == 200
+    assert seen == [None]
+    # Uncached reads later in the request keep the route's preference
+    assert isinstance(after, SecondaryPreferred)
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import statistics
+import time
+
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+import server
+
+from .league import generate_league
+
+DOCUMENTS = 10_000
+ROUNDS = 5
+
+
+def match_documents(n=DOCUMENTS):
+    """Match documents as Motor returns them, _id included"""
+    # A double round-robin of 101 teams has 10,100 matches
+    docs = generate_league(101)["matches"][:n]
+    for doc in docs:
+        doc["_id"] = ObjectId()
+        doc["status"] = doc["status"].value
+    return docs
+
+
+def legacy_path(docs):
+    """One model per document, then FastAPI's response_model validation and encoding"""
+    route = next(r for r in server.app.routes if getattr(r, "path", "") == "/api/matches" and "GET" in r.methods)
+    items = [server.Match(**doc) for doc in docs]
+    content = asyncio.run(serialize_response(field=route.response_field, response_content=items, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_path(docs):
+    return server.model_list_response(server.Match, docs, Response()).body
+
+
+def timed(path, docs):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        body = path(docs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), body
+
+
+def test_fast_list_serialization_benchmark():
+    """Same output as the response_model path; timings are reported (pytest -s), not asserted"""
+    docs = match_documents()
+    legacy_seconds, legacy_body = timed(legacy_path, docs)
+    fast_seconds, fast_body = timed(fast_path, docs)
+
+    print(
+        f"\n{DOCUMENTS} matches: legacy {legacy_seconds * 1000:.1f} ms, "
+        f"fast {fast_seconds * 1000:.1f} ms ({legacy_seconds / fast_seconds:.1f}x)"
+    )
+    assert json.loads(fast_body) == json.loads(legacy_body)
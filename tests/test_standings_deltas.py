@@ -0,0 +1,137 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+import server
+
+TEAMS = 6
+LATE_TEAMS = 2
+STEPS = 120
+
+
+def score(rng, **fields):
+    return server.MatchUpdate(home_team_score=rng.randint(0, 3), away_team_score=rng.randint(0, 3), **fields)
+
+
+async def random_writes(rng, team_ids):
+    """Create, score, finish, correct, reopen and delete matches through the routes.
+
+    A few teams join mid-season, after matchdays they have no row in were recorded.
+    """
+    kickoff = datetime(2024, 8, 1, 15)
+    slot = 0
+    matches = []
+    late_teams = LATE_TEAMS
+
+    async def create(home, away):
+        nonlocal slot
+        # Distinct kick-offs, so that form order never depends on ties
+        slot += 1
+        match = await server.create_match(server.MatchCreate(
+            home_team_id=home, away_team_id=away, venue="Stadium",
+            match_date=kickoff + timedelta(days=rng.randint(0, 20), minutes=slot),
+        ))
+        matches.append(match.id)
+
+    for step in range(STEPS):
+        if late_teams and step >= STEPS // 2 and rng.random() < 0.1:
+            late_teams -= 1
+            team = await server.create_team(server.TeamCreate(name=f"Late {late_teams}", city="Boston"))
+            team_ids.append(team.id)
+            continue
+        action = rng.choice(["create", "create", "live", "finish", "finish", "correct", "reopen", "unscored", "delete"])
+        if action == "create" or not matches:
+            await create(*rng.sample(team_ids, 2))
+            continue
+        match_id = rng.choice(matches)
+        if action == "live":
+            await server.update_match(match_id, score(rng, status=server.MatchStatus.LIVE))
+        elif action == "finish":
+            await server.update_match(match_id, score(rng, status=server.MatchStatus.FINISHED))
+        elif action == "correct":
+            await server.update_match(match_id, score(rng))
+        elif action == "reopen":
+            status = rng.choice([server.MatchStatus.LIVE, server.MatchStatus.CANCELLED, server.MatchStatus.SCHEDULED])
+            await server.update_match(match_id, server.MatchUpdate(status=status))
+        elif action == "unscored":
+            # Finished without a score only when none was ever recorded
+            await server.update_match(match_id, server.MatchUpdate(status=server.MatchStatus.FINISHED))
+        else:
+            await server.delete_match(match_id)
+            matches.remove(match_id)
+
+
+async def derived_state(db):
+    """Head-to-head totals, displayed form and the table in effect per matchday, as stored"""
+    head_to_head = {}
+    async for pair in db.head_to_head.find({"season_id": None}, {"_id": 0}):
+        counters = {field: pair.get(field, 0) for field in server.STANDINGS_FIELDS}
+        # Pairs whose matches were all undone keep zeroed counters
+        if any(counters.values()):
+            head_to_head[(pair["team_id"], pair["opponent_id"])] = counters
+
+    form = {row["team_id"]: server.form_string(row.get("form", [])) async for row in db.standings.find({"season_id": None})}
+
+    tables = {}
+    async for row in db.standings_history.find({"season_id": None}, {"_id": 0}):
+        tables.setdefault(row["date"], {})[row["team_id"]] = {field: row[field] for field in server.STANDINGS_FIELDS}
+    return head_to_head, form, tables
+
+
+def table_in_effect(tables, day):
+    """Matchdays emptied by deletions keep a carried-forward table: compare what a reader sees"""
+    recorded = [date for date in tables if date <= day]
+    table = tables[max(recorded)] if recorded else {}
+    # Before any result counts, an all-zero table reads the same as none
+    return table if any(any(row.values()) for row in table.values()) else {}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_writes_match_a_rebuild(db, monkeypatch, seed):
+    monkeypatch.setattr(server, "live_buffer", None)
+    rng = random.Random(seed)
+
+    async def main():
+        teams = [await server.create_team(server.TeamCreate(name=f"Team {i}", city="Boston")) for i in range(TEAMS)]
+        await random_writes(rng, [team.id for team in teams])
+
+        stored = await db.counters.find_one({"_id": server.counters_id(None)}, {"_id": 0})
+        counters = {field: stored.get(field, 0) for field in server.DASHBOARD_COUNTERS}
+        head_to_head, form, tables = await derived_state(db)
+
+        assert counters == await server.rebuild_counters()
+        assert (await server.rebuild_standings())["drift"] == []
+        await server.rebuild_snapshots()
+        rebuilt_head_to_head, rebuilt_form, rebuilt_tables = await derived_state(db)
+
+        assert head_to_head == rebuilt_head_to_head
+        assert form == rebuilt_form
+        for day in sorted(set(tables) | set(rebuilt_tables)):
+            assert table_in_effect(tables, day) == table_in_effect(rebuilt_tables, day), day
+
+    asyncio.run(main())
+
+
+def test_team_joining_after_a_recorded_matchday(db, monkeypatch):
+    monkeypatch.setattr(server, "live_buffer", None)
+
+    async def play(home, away, day):
+        match = await server.create_match(server.MatchCreate(
+            home_team_id=home.id, away_team_id=away.id, venue="Stadium", match_date=datetime(2024, 9, day, 15),
+        ))
+        await server.update_match(match.id, server.MatchUpdate(home_team_score=1, away_team_score=0, status=server.MatchStatus.FINISHED))
+
+    async def main():
+        a, b, c = [await server.create_team(server.TeamCreate(name=name, city="Boston")) for name in "ABC"]
+        await play(a, b, 10)
+        d = await server.create_team(server.TeamCreate(name="D", city="Boston"))
+        # An earlier matchday is created, and the later one must count the result too
+        await play(c, d, 3)
+        day = await server.snapshot_date(None, as_of=datetime(2024, 9, 10))
+        return c.id, d.id, {row["team_id"]: row["points"] for row in await server.read_snapshot(None, day)}
+
+    c_id, d_id, points = asyncio.run(main())
+    assert points[c_id] == 3
+    assert points[d_id] == 0
+    assert len(points) == 4
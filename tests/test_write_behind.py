@@ -0,0 +1,147 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+import server
+from fastapi import HTTPException
+from write_behind import WriteBehindBuffer
+
+# Long enough that nothing flushes on its own during a test
+WINDOW = 60
+
+
+def score(home, away, **fields):
+    return server.MatchUpdate(home_team_score=home, away_team_score=away, **fields)
+
+
+async def start_live_match():
+    home = await server.create_team(server.TeamCreate(name="Home", city="Boston"))
+    away = await server.create_team(server.TeamCreate(name="Away", city="Cambridge"))
+    match = await server.create_match(server.MatchCreate(
+        home_team_id=home.id, away_team_id=away.id, match_date=datetime(2024, 8, 3, 15), venue="Stadium",
+    ))
+    # Scheduled -> live is written directly
+    return await server.update_match(match.id, score(0, 0, status=server.MatchStatus.LIVE))
+
+
+async def assert_no_drift(db):
+    stored = await db.counters.find_one({"_id": server.counters_id(None)}, {"_id": 0})
+    counters = {field: stored.get(field, 0) for field in server.DASHBOARD_COUNTERS}
+    assert counters == await server.rebuild_counters()
+    assert (await server.rebuild_standings())["drift"] == []
+
+
+@pytest.fixture
+def run(db, monkeypatch):
+    """Run a scenario against a fresh database with the write-behind buffer enabled"""
+    flushes = []
+
+    async def flush_changes(changes):
+        flushes.append(len(changes))
+        await server.flush_buffered_matches(changes)
+
+    def runner(scenario):
+        async def main():
+            buffer = WriteBehindBuffer(WINDOW, flush_changes)
+            monkeypatch.setattr(server, "live_buffer", buffer)
+            try:
+                await scenario(db, buffer, flushes)
+            finally:
+                await buffer.close()
+        asyncio.run(main())
+
+    return runner
+
+
+def test_live_updates_are_coalesced_into_one_write(run):
+    async def scenario(db, buffer, flushes):
+        match = await start_live_match()
+        for home, away in ((1, 0), (2, 0), (2, 1)):
+            await server.update_match(match.id, score(home, away))
+
+        stored = await db.matches.find_one({"id": match.id})
+        assert (stored["home_team_score"], stored["away_team_score"], stored["version"]) == (0, 0, 1)
+        read = await server.get_match(match.id)
+        assert (read.home_team_score, read.away_team_score, read.version) == (2, 1, 4)
+
+        await buffer.flush()
+        assert flushes == [1]
+        stored = await db.matches.find_one({"id": match.id})
+        assert (stored["home_team_score"], stored["away_team_score"], stored["version"]) == (2, 1, 4)
+        assert (await db.counters.find_one({"_id": server.counters_id(None)}))["goals_scored"] == 3
+        await assert_no_drift(db)
+
+    run(scenario)
+
+
+def test_finishing_a_match_writes_its_buffered_score_first(run):
+    async def scenario(db, buffer, flushes):
+        match = await start_live_match()
+        await server.update_match(match.id, score(1, 0))
+        finished = await server.update_match(match.id, server.MatchUpdate(status=server.MatchStatus.FINISHED))
+
+        assert flushes == [1]
+        assert buffer.pending(match.id) is None
+        assert (finished.home_team_score, finished.away_team_score, finished.version) == (1, 0, 3)
+        stored = await db.matches.find_one({"id": match.id})
+        assert (stored["status"], stored["home_team_score"], stored["version"]) == ("finished", 1, 3)
+        standings = {row["team_id"]: row["points"] for row in await server.read_standings()}
+        assert standings == {match.home_team_id: 3, match.away_team_id: 0}
+        await assert_no_drift(db)
+
+    run(scenario)
+
+
+def test_buffered_update_is_dropped_when_another_process_wrote_the_match(run, monkeypatch):
+    async def scenario(db, buffer, flushes):
+        match = await start_live_match()
+        await server.update_match(match.id, score(2, 0))
+
+        # Another worker, without this buffer, records 1-0 in the meantime
+        monkeypatch.setattr(server, "live_buffer", None)
+        await server.update_match(match.id, score(1, 0))
+        monkeypatch.setattr(server, "live_buffer", buffer)
+
+        await buffer.flush()
+        read = await server.get_match(match.id)
+        assert (read.home_team_score, read.away_team_score, read.version) == (1, 0, 2)
+        # Only the write that reached the database moved the counters
+        assert (await db.counters.find_one({"_id": server.counters_id(None)}))["goals_scored"] == 1
+        await assert_no_drift(db)
+
+    run(scenario)
+
+
+def test_deleting_a_match_discards_its_buffered_state(run):
+    async def scenario(db, buffer, flushes):
+        match = await start_live_match()
+        await server.update_match(match.id, score(3, 3))
+        await server.delete_match(match.id)
+
+        assert buffer.pending(match.id) is None
+        with pytest.raises(HTTPException) as error:
+            await server.get_match(match.id)
+        assert error.value.status_code == 404
+        await assert_no_drift(db)
+
+    run(scenario)
+
+
+def test_failed_flush_is_retried_without_further_updates():
+    attempts = []
+
+    async def flush_changes(changes):
+        attempts.append(len(changes))
+        if len(attempts) == 1:
+            raise RuntimeError("primary stepped down")
+
+    async def main():
+        buffer = WriteBehindBuffer(0.01, flush_changes)
+        buffer.stage("match", {"version": 1}, {"version": 2})
+        await asyncio.sleep(0.2)
+        pending = buffer.pending("match")
+        await buffer.close()
+        return pending
+
+    assert asyncio.run(main()) is None
+    assert attempts == [1, 1]